@@ -0,0 +1,134 @@
+"""
+Simulates a noisy-neighbour load and compares a single FIFO queue with the
+deficit round robin scheduler used by the fair dispatcher.
+
+One noisy tenant submits a large burst at t=0 while several small tenants keep
+submitting jobs at a steady (Poisson) rate. The simulation reports latency
+(submit to completion) percentiles for the small tenants under each policy,
+then times `DeficitRoundRobin.select` with increasing numbers of active tenants
+to show that the per-dispatch cost does not grow with tenant count.
+
+    python scripts/bench_fair_queue.py [--noisy-jobs 20000] [--workers 8]
+"""
+import argparse
+import heapq
+import os
+import random
+import statistics
+import sys
+import timeit
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.core.fair_queue import DeficitRoundRobin  # noqa: E402
+
+Arrival = Tuple[float, str]
+
+
+def make_arrivals(args: argparse.Namespace) -> List[Arrival]:
+    rng = random.Random(args.seed)
+    arrivals: List[Arrival] = [(0.0, "noisy")] * args.noisy_jobs
+    for i in range(args.small_tenants):
+        t = 0.0
+        while True:
+            t += rng.expovariate(1.0 / args.small_interval)
+            if t > args.duration:
+                break
+            arrivals.append((t, f"small-{i}"))
+    arrivals.sort(key=lambda a: a[0])
+    return arrivals
+
+
+def simulate(arrivals: List[Arrival], workers: int, service_time: float, fair: bool) -> Dict[str, List[float]]:
+    """
+    Runs the queue until every job has completed and returns latencies per tenant class.
+    """
+    fifo: Deque[Arrival] = deque()
+    sub_queues: Dict[str, Deque[float]] = {}
+    drr = DeficitRoundRobin()
+    completions: List[float] = []  # heap of worker finish times
+    idle = workers
+    latencies: Dict[str, List[float]] = {"noisy": [], "small": []}
+    i = 0
+    now = 0.0
+
+    def pop_job() -> Arrival:
+        if not fair:
+            return fifo.popleft()
+        while True:
+            tenant = drr.select()
+            queue = sub_queues[tenant]
+            if queue:
+                return queue.popleft(), tenant
+            drr.remove(tenant)
+
+    pending = 0
+    while i < len(arrivals) or completions:
+        next_arrival = arrivals[i][0] if i < len(arrivals) else float("inf")
+        next_completion = completions[0] if completions else float("inf")
+        if next_arrival <= next_completion:
+            now, tenant = arrivals[i]
+            i += 1
+            pending += 1
+            if fair:
+                sub_queues.setdefault(tenant, deque()).append(now)
+                drr.activate(tenant)
+            else:
+                fifo.append((now, tenant))
+        else:
+            now = heapq.heappop(completions)
+            idle += 1
+
+        while idle and pending:
+            submitted, tenant = pop_job()
+            pending -= 1
+            idle -= 1
+            finish = now + service_time
+            heapq.heappush(completions, finish)
+            latencies["noisy" if tenant == "noisy" else "small"].append(finish - submitted)
+    return latencies
+
+
+def percentile(values: List[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100)[int(pct) - 1] if len(values) > 1 else values[0]
+
+
+def select_cost_ns(tenants: int, iterations: int = 200000) -> float:
+    drr = DeficitRoundRobin()
+    for t in range(tenants):
+        drr.activate(f"tenant-{t}")
+    return timeit.timeit(drr.select, number=iterations) / iterations * 1e9
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--noisy-jobs", type=int, default=20000)
+    parser.add_argument("--small-tenants", type=int, default=10)
+    parser.add_argument("--small-interval", type=float, default=5.0, help="Mean seconds between small-tenant jobs")
+    parser.add_argument("--duration", type=float, default=600.0, help="Seconds small tenants keep submitting")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--service-time", type=float, default=0.5, help="Seconds per job")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    arrivals = make_arrivals(args)
+    print(f"{len(arrivals)} jobs, {args.workers} workers, {args.service_time}s per job\n")
+    print(f"{'policy':<6} {'small p50 s':>12} {'small p99 s':>12} {'small max s':>12} {'noisy p50 s':>12}")
+    for label, fair in (("fifo", False), ("drr", True)):
+        lat = simulate(arrivals, args.workers, args.service_time, fair)
+        small = lat["small"]
+        print(
+            f"{label:<6} {percentile(small, 50):>12.1f} {percentile(small, 99):>12.1f} "
+            f"{max(small):>12.1f} {percentile(lat['noisy'], 50):>12.1f}"
+        )
+
+    print(f"\n{'active tenants':>14} {'select() ns':>12}")
+    for tenants in (10, 1000, 100000):
+        print(f"{tenants:>14} {select_cost_ns(tenants):>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,127 @@
+"""
+Measures logging overhead per API request as seen by the request thread.
+
+Each simulated request makes the log calls of a job submission plus a status
+poll. stdout is replaced with a sink whose writes take `--sink-latency-us`,
+standing in for a slow or back-pressured log collector. The configurations
+compared are:
+
+- sync:  StreamHandler on stdout (the previous setup), f-string vs %-style
+- async: QueueHandler/QueueListener, so the caller only enqueues the record
+- JSON:  python-json-logger vs orjson formatters
+- sampling of the "Fetched status" logger, and calls below the active level
+
+    python scripts/bench_logging.py [--requests 20000] [--sink-latency-us 50]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.core import logging_config  # noqa: E402
+from src.api.core.logging_config import setup_logging  # noqa: E402
+
+submit_logger = logging.getLogger("bench.routers.jobs")
+status_logger = logging.getLogger("bench.routers.status")
+
+
+class SlowSink:
+    """
+    File-like object whose writes block for a fixed time, releasing the GIL
+    like a write() to a full pipe would.
+    """
+
+    def __init__(self, latency_s: float) -> None:
+        self.latency_s = latency_s
+
+    def write(self, data: str) -> int:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+class Job:
+    id = 12345
+    job_type = "Data Analysis"
+    status = "queued"
+
+
+def request_fstring(job: Job, client: str) -> None:
+    submit_logger.info(f"Received new job submission request from {client}: type={job.job_type}")
+    submit_logger.info(f"API received job {job.id} queued for processing (type: {job.job_type})")
+    status_logger.info(f"Fetched status for job {job.id}: {job.status}")
+
+
+def request_lazy(job: Job, client: str) -> None:
+    submit_logger.info("Received new job submission request from %s: type=%s", client, job.job_type)
+    submit_logger.info("API received job %s queued for processing (type: %s)", job.id, job.job_type)
+    status_logger.info("Fetched status for job %s: %s", job.id, job.status)
+
+
+def run(
+    requests: int,
+    request: Callable[[Job, str], None],
+    sink: SlowSink,
+    level: str = "INFO",
+    json_logs: bool = False,
+    async_logs: bool = False,
+    sample_rates: Optional[Dict[str, float]] = None,
+    use_orjson: bool = True,
+) -> float:
+    """
+    Returns the mean caller-side microseconds per request for one configuration.
+    """
+    real_stdout, real_orjson = sys.stdout, logging_config.orjson
+    sys.stdout = sink
+    if not use_orjson:
+        logging_config.orjson = None
+    try:
+        status_logger.filters.clear()
+        setup_logging(level=level, json_logs=json_logs, async_logs=async_logs, sample_rates=sample_rates)
+        job = Job()
+        started = time.perf_counter()
+        for _ in range(requests):
+            request(job, "10.0.0.1")
+        elapsed = time.perf_counter() - started
+        logging_config._stop_listener()
+    finally:
+        sys.stdout, logging_config.orjson = real_stdout, real_orjson
+    return elapsed / requests * 1e6
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sink-latency-us", type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    sink = SlowSink(args.sink_latency_us / 1e6)
+    sampled = {status_logger.name: 0.01}
+    cases = [
+        ("sync text, f-string (before)", dict(request=request_fstring)),
+        ("sync text, %-style", dict(request=request_lazy)),
+        ("async text, %-style", dict(request=request_lazy, async_logs=True)),
+        ("sync JSON, python-json-logger", dict(request=request_lazy, json_logs=True, use_orjson=False)),
+        ("sync JSON, orjson", dict(request=request_lazy, json_logs=True)),
+        ("async JSON, orjson", dict(request=request_lazy, json_logs=True, async_logs=True)),
+        ("async JSON, orjson, status sampled 1%", dict(request=request_lazy, json_logs=True, async_logs=True,
+                                                       sample_rates=sampled)),
+        ("level WARNING, f-string", dict(request=request_fstring, level="WARNING")),
+        ("level WARNING, %-style", dict(request=request_lazy, level="WARNING")),
+    ]
+    print(f"{'configuration':<40} {'us/request':>10}")
+    for label, kwargs in cases:
+        print(f"{label:<40} {run(args.requests, sink=sink, **kwargs):>10.2f}")
+    logging.getLogger().handlers.clear()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,81 @@
+"""
+Measures Redis cost per job with and without the Celery result backend.
+
+For each mode an in-process worker consumes N no-op jobs sent the way the API
+sends them, and the script reports Redis commands per job, commands/sec, keys
+left behind and used_memory growth (from INFO commandstats / INFO memory).
+Requires a running Redis; use a scratch database index:
+
+    docker compose up -d redis
+    python scripts/bench_result_backend.py --redis-url redis://localhost:6379/15 --jobs 2000
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import redis  # noqa: E402
+from celery import Celery  # noqa: E402
+from celery.contrib.testing.worker import start_worker  # noqa: E402
+
+
+def command_calls(client: "redis.Redis") -> int:
+    stats = client.info("commandstats")
+    return sum(int(v["calls"]) for v in stats.values())
+
+
+def run_mode(redis_url: str, store_results: bool, jobs: int) -> Dict[str, float]:
+    app = Celery("bench", broker=redis_url, backend=redis_url)
+    if not store_results:
+        app.backend_cls = "disabled"
+    app.conf.update(task_ignore_result=not store_results, result_expires=3600)
+
+    @app.task(name="bench.process_job")
+    def process_job(job_id: int) -> None:
+        return None
+
+    client = redis.from_url(redis_url)
+    keys_before = client.dbsize()
+    memory_before = int(client.info("memory")["used_memory"])
+    calls_before = command_calls(client)
+    started = time.perf_counter()
+
+    with start_worker(app, pool="solo", perform_ping_check=False, loglevel="WARNING"):
+        for job_id in range(jobs):
+            app.send_task("bench.process_job", args=[job_id])
+        while client.llen("celery") > 0:
+            time.sleep(0.05)
+        time.sleep(0.5)
+
+    elapsed = time.perf_counter() - started
+    # Subtract the INFO calls this script made itself
+    calls = command_calls(client) - calls_before - 2
+    return {
+        "commands_per_job": calls / jobs,
+        "commands_per_sec": calls / elapsed,
+        "keys_left": client.dbsize() - keys_before,
+        "memory_growth_kb": (int(client.info("memory")["used_memory"]) - memory_before) / 1024,
+    }
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379/15"))
+    parser.add_argument("--jobs", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':<16} {'cmds/job':>9} {'cmds/sec':>10} {'keys left':>10} {'mem growth KB':>14}")
+    for label, store in (("result backend", True), ("jobs table only", False)):
+        r = run_mode(args.redis_url, store, args.jobs)
+        print(
+            f"{label:<16} {r['commands_per_job']:>9.1f} {r['commands_per_sec']:>10.0f} "
+            f"{r['keys_left']:>10} {r['memory_growth_kb']:>14.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
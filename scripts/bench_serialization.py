@@ -0,0 +1,100 @@
+"""
+Benchmarks task message serializers: bytes on the wire, approximate Redis memory
+per queued message, and encode/decode CPU per message.
+
+Messages are built with Celery's own protocol-2 encoder and wrapped in the JSON
+envelope the kombu Redis transport stores in the queue list (body base64-encoded),
+so "envelope" bytes approximate what each queued message costs in Redis.
+Payloads are carried in the task kwargs, as they will be once workers stop
+fetching the job row before processing.
+
+    python scripts/bench_serialization.py [--iterations 2000]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import timeit
+import uuid
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from celery import Celery  # noqa: E402
+from kombu.serialization import dumps, loads  # noqa: E402
+
+from src.api.core.serialization import SERIALIZER_NAME, register_job_serializer  # noqa: E402
+
+
+def make_payloads() -> Dict[str, Dict[str, Any]]:
+    return {
+        "small": {"input_data": 100},
+        "medium": {
+            "recipients": [f"user{i}@example.com" for i in range(100)],
+            "subject": "Monthly report",
+            "body": "Hello, your report is ready. " * 20,
+        },
+        "large": {
+            "rows": [
+                {"id": i, "region": "eu-west", "value": i * 1.5, "tags": ["a", "b", "c"], "ok": i % 2 == 0}
+                for i in range(2000)
+            ],
+        },
+    }
+
+
+def envelope_size(app: Celery, serializer: str, payload: Dict[str, Any]) -> Dict[str, int]:
+    msg = app.amqp.as_task_v2(
+        str(uuid.uuid4()),
+        "src.worker.celery_worker.process_job",
+        args=(12345,),
+        kwargs={"job_type": "Data Analysis", "payload": payload},
+    )
+    content_type, content_encoding, body = dumps(msg.body, serializer=serializer)
+    if isinstance(body, str):
+        body = body.encode(content_encoding)
+    envelope = json.dumps({
+        "body": base64.b64encode(body).decode("ascii"),
+        "content-encoding": content_encoding,
+        "content-type": content_type,
+        "headers": msg.headers,
+        "properties": {"body_encoding": "base64", "delivery_info": {"exchange": "", "routing_key": "job_queue"}},
+    }, default=str)
+    return {"body": len(body), "envelope": len(envelope)}
+
+
+def cpu_per_message_us(serializer: str, body: Any, iterations: int) -> Dict[str, float]:
+    content_type, content_encoding, data = dumps(body, serializer=serializer)
+    encode = timeit.timeit(lambda: dumps(body, serializer=serializer), number=iterations)
+    decode = timeit.timeit(
+        lambda: loads(data, content_type, content_encoding, accept=[content_type]),
+        number=iterations,
+    )
+    return {"encode": encode / iterations * 1e6, "decode": decode / iterations * 1e6}
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--threshold", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    register_job_serializer("zstd", args.threshold)
+    app = Celery("bench", broker="memory://")
+
+    print(f"{'payload':<8} {'serializer':<10} {'body B':>9} {'envelope B':>11} {'encode us':>10} {'decode us':>10}")
+    for label, payload in make_payloads().items():
+        task_body = ((12345,), {"job_type": "Data Analysis", "payload": payload}, {})
+        for serializer in ("json", "msgpack", SERIALIZER_NAME):
+            sizes = envelope_size(app, serializer, payload)
+            cpu = cpu_per_message_us(serializer, task_body, args.iterations)
+            print(
+                f"{label:<8} {serializer:<10} {sizes['body']:>9} {sizes['envelope']:>11} "
+                f"{cpu['encode']:>10.1f} {cpu['decode']:>10.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,115 @@
+"""
+Measures job write throughput and listing latency as the number of shards grows.
+
+Each shard is a separate SQLite file (a local stand-in for a database server:
+SQLite serializes writers per file much like a single primary serializes
+commits). `--threads` writers insert jobs with shard-encoded ids, each insert
+committed on its own like POST /jobs/submit, then every job is read back by id
+through its shard as GET /jobs/status does. Finally the "50 newest jobs"
+listing is timed with a sequential and a parallel scatter-gather over shards.
+
+    python scripts/bench_sharding.py [--jobs 4000] [--threads 8] [--shards 1 2 4]
+"""
+import argparse
+import heapq
+import itertools
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from src.api.core.database import ShardSessions  # noqa: E402
+from src.api.core.ids import SnowflakeIdGenerator, pick_shard  # noqa: E402
+from src.api.core.migrations import upgrade  # noqa: E402
+from src.api.models.sql_models.job import Job as JobModel  # noqa: E402
+
+
+def make_shards(directory: str, count: int) -> List[sessionmaker]:
+    factories = []
+    for i in range(count):
+        url = f"sqlite:///{os.path.join(directory, f'shard{i}.db')}"
+        upgrade("head", database_url=url)
+        engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 60})
+        factories.append(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    return factories
+
+
+def run(shards: int, jobs: int, threads: int) -> None:
+    generator = SnowflakeIdGenerator(node_id=0)
+    with tempfile.TemporaryDirectory() as directory:
+        factories = make_shards(directory, shards)
+
+        def submit(_: int) -> int:
+            sessions = ShardSessions(factories)
+            try:
+                shard = pick_shard(shards)
+                db = sessions.for_shard(shard)
+                job = JobModel(id=generator.next_id(shard), job_type="bench", payload={"n": 1}, status="queued")
+                db.add(job)
+                db.commit()
+                return int(job.id)
+            finally:
+                sessions.close()
+
+        def fetch(job_id: int) -> None:
+            sessions = ShardSessions(factories)
+            try:
+                sessions.for_job(job_id).query(JobModel).filter(JobModel.id == job_id).first()
+            finally:
+                sessions.close()
+
+        with ThreadPoolExecutor(threads) as pool:
+            started = time.perf_counter()
+            job_ids = list(pool.map(submit, range(jobs)))
+            write_rate = jobs / (time.perf_counter() - started)
+
+            started = time.perf_counter()
+            list(pool.map(fetch, job_ids))
+            read_rate = jobs / (time.perf_counter() - started)
+
+            def recent(shard: int) -> List[JobModel]:
+                db = factories[shard]()
+                try:
+                    return db.query(JobModel).order_by(JobModel.id.desc()).limit(50).all()
+                finally:
+                    db.close()
+
+            def newest(per_shard) -> List[JobModel]:
+                return list(itertools.islice(heapq.merge(*per_shard, key=lambda job: job.id, reverse=True), 50))
+
+            rounds = 50
+            started = time.perf_counter()
+            for _ in range(rounds):
+                newest([recent(shard) for shard in range(shards)])
+            sequential_ms = (time.perf_counter() - started) / rounds * 1000
+
+            started = time.perf_counter()
+            for _ in range(rounds):
+                newest(list(pool.map(recent, range(shards))))
+            parallel_ms = (time.perf_counter() - started) / rounds * 1000
+
+        print(f"{shards:>6} {write_rate:>12.0f} {read_rate:>12.0f} {sequential_ms:>14.2f} {parallel_ms:>14.2f}")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=4000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args(argv)
+
+    print(f"{'shards':>6} {'writes/s':>12} {'reads/s':>12} {'list seq ms':>14} {'list par ms':>14}")
+    for shards in args.shards:
+        run(shards, args.jobs, args.threads)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,214 @@
+"""
+Checks the cold import time of the API and worker entry points, and the cold
+start of each (import plus startup, without a broker or database), against
+either a baseline commit or a fixed budget.
+
+Each module is imported in a fresh interpreter with `python -X importtime` and the
+cumulative time reported for the top-level module is measured. The startup checks
+import the API and run its startup handlers, and import the worker and build its
+WorkController (app finalization, task registry, pool and consumer blueprint),
+timing both together.
+
+With `--baseline REF`, the same checks also run against REF checked out in a
+temporary git worktree, alternating with this tree's runs so both see the same
+machine load. A check fails when its median is more than `--tolerance` (plus
+`--slack-ms`) above the baseline's; this is what CI uses, as wall-clock numbers
+differ between runners. Checks that cannot run at REF fall back to their budget:
+
+    python scripts/check_import_time.py --baseline origin/main
+    python scripts/check_import_time.py --module src.api.main=1500 --startup-budget 1200 --runs 5
+
+Without a baseline, the fixed budgets sit about twice above the medians measured
+on a developer machine: a coarse backstop for local runs, not a regression gate.
+Exits non-zero when any check fails.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Callable, Dict, List, Optional
+
+# Budgets in milliseconds (median of several cold runs)
+DEFAULT_BUDGETS_MS: Dict[str, float] = {
+    "src.api.main": 2000.0,
+    "src.worker.celery_worker": 1200.0,
+}
+# Import of each entry point plus its startup, in milliseconds
+DEFAULT_STARTUP_BUDGET_MS = 1600.0
+DEFAULT_WORKER_STARTUP_BUDGET_MS = 1300.0
+
+STARTUP_SNIPPET = """
+import asyncio, time
+started = time.perf_counter()
+from src.api.main import app
+asyncio.run(app.router.startup())
+print((time.perf_counter() - started) * 1000)
+"""
+
+WORKER_STARTUP_SNIPPET = """
+import time
+started = time.perf_counter()
+from src.worker.celery_worker import celery_app
+celery_app.WorkController(pool_cls="threads", hostname="import-check@localhost", queues=["job_queue"])
+print((time.perf_counter() - started) * 1000)
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _subprocess_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    # Engines are built lazily, so any URL works; avoid needing a live database.
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    # A fixed node id keeps startup from leasing one in Redis.
+    env.setdefault("NODE_ID", "0")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def measure_import_ms(module: str, root: str = ROOT) -> float:
+    """
+    Imports `module` in a subprocess and returns its cumulative import time in ms.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root,
+        env=_subprocess_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in proc.stderr.splitlines():
+        # Format: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000.0
+    raise RuntimeError(f"No importtime entry found for {module}")
+
+
+def measure_snippet_ms(snippet: str, root: str = ROOT) -> float:
+    """
+    Runs a startup snippet in a subprocess; returns the ms it reports.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=root,
+        env=_subprocess_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def measure_startup_ms(root: str = ROOT) -> float:
+    """
+    Imports the API and runs its startup handlers; returns the ms taken.
+    """
+    return measure_snippet_ms(STARTUP_SNIPPET, root)
+
+
+def measure_worker_startup_ms(root: str = ROOT) -> float:
+    """
+    Imports the worker and builds its WorkController; returns the ms taken.
+    """
+    return measure_snippet_ms(WORKER_STARTUP_SNIPPET, root)
+
+
+class BaselineTree:
+    """
+    A temporary git worktree checked out at `ref`, removed on exit.
+    """
+
+    def __init__(self, ref: str) -> None:
+        self.ref = ref
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp.name, "baseline")
+
+    def __enter__(self) -> "BaselineTree":
+        subprocess.run(["git", "worktree", "add", "--detach", self.root, self.ref],
+                       cwd=ROOT, capture_output=True, text=True, check=True)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        subprocess.run(["git", "worktree", "remove", "--force", self.root], cwd=ROOT, capture_output=True)
+        self._tmp.cleanup()
+
+
+def run_checks(checks: Dict[str, Callable[[str], float]], budgets: Dict[str, float], runs: int,
+               baseline_root: Optional[str], tolerance: float, slack_ms: float) -> bool:
+    """
+    Measures every check (alternating with the baseline, if any); returns True if all pass.
+    """
+    current: Dict[str, List[float]] = {name: [] for name in checks}
+    baseline: Dict[str, Optional[List[float]]] = {name: [] if baseline_root else None for name in checks}
+    for _ in range(runs):
+        for name, measure in checks.items():
+            current[name].append(measure(ROOT))
+            samples = baseline[name]
+            if baseline_root is not None and samples is not None:
+                try:
+                    samples.append(measure(baseline_root))
+                except (subprocess.CalledProcessError, RuntimeError, ValueError):
+                    # Not measurable at the baseline (e.g. added since): use the budget
+                    baseline[name] = None
+
+    passed = True
+    for name in checks:
+        median = statistics.median(current[name])
+        samples = baseline[name]
+        if samples:
+            reference = statistics.median(samples)
+            limit = reference * (1 + tolerance) + slack_ms
+            detail = f"baseline {reference:.1f} ms, limit {limit:.0f} ms"
+        else:
+            limit = budgets[name]
+            detail = f"budget {limit:.0f} ms"
+        ok = median <= limit
+        passed &= ok
+        print(f"{'OK  ' if ok else 'FAIL'} {name}: {median:.1f} ms ({detail})")
+    return passed
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", action="append", default=[], help="module=budget_ms (repeatable)")
+    parser.add_argument("--startup-budget", type=float, default=DEFAULT_STARTUP_BUDGET_MS,
+                        help="Budget in ms for the API's import plus lifespan startup")
+    parser.add_argument("--worker-startup-budget", type=float, default=DEFAULT_WORKER_STARTUP_BUDGET_MS,
+                        help="Budget in ms for the worker's import plus WorkController setup")
+    parser.add_argument("--runs", type=int, default=3, help="Cold runs per check (median is used)")
+    parser.add_argument("--baseline", metavar="REF", help="Compare against this git ref instead of the budgets")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown over the baseline, as a fraction (default 0.25)")
+    parser.add_argument("--slack-ms", type=float, default=50.0,
+                        help="Allowed slowdown over the baseline in ms, on top of --tolerance")
+    args = parser.parse_args(argv)
+
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for item in args.module:
+        name, _, budget = item.partition("=")
+        budgets[name] = float(budget) if budget else budgets.get(name, 0.0)
+
+    checks: Dict[str, Callable[[str], float]] = {
+        module: (lambda root, module=module: measure_import_ms(module, root)) for module in budgets
+    }
+    checks["src.api.main startup"] = measure_startup_ms
+    checks["src.worker.celery_worker startup"] = measure_worker_startup_ms
+    budgets["src.api.main startup"] = args.startup_budget
+    budgets["src.worker.celery_worker startup"] = args.worker_startup_budget
+
+    if args.baseline:
+        with BaselineTree(args.baseline) as tree:
+            passed = run_checks(checks, budgets, args.runs, tree.root, args.tolerance, args.slack_ms)
+    else:
+        passed = run_checks(checks, budgets, args.runs, None, args.tolerance, args.slack_ms)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
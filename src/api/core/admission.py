@@ -0,0 +1,217 @@
+import datetime
+import math
+import threading
+import time
+from functools import lru_cache, partial
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import func
+
+from ..models.sql_models.job import Job as JobModel
+from .database import get_shard_session_factory, get_shard_urls
+from .logging_config import get_logger
+from .settings import settings
+
+logger = get_logger(__name__)
+
+# (queued jobs per job_type, jobs finished in the last `rate_window` seconds per job_type)
+QueueSample = Tuple[Dict[str, int], Dict[str, int]]
+
+
+def sample_queue_from_db(rate_window: float) -> QueueSample:
+    """
+    Reads queue depth and recent completions per job_type from the jobs table
+    of every shard with two grouped queries each, summed across shards. Depth
+    is served by the status/job_type index and completions by the
+    status/updated_at index, so neither scans the finished job history.
+    """
+    since = datetime.datetime.utcnow() - datetime.timedelta(seconds=rate_window)
+    depth: Dict[str, int] = {}
+    finished: Dict[str, int] = {}
+    for shard in range(len(get_shard_urls())):
+        db = get_shard_session_factory(shard)()
+        try:
+            for job_type, count in (
+                db.query(JobModel.job_type, func.count())
+                .filter(JobModel.status.in_(("queued", "retrying")))
+                .group_by(JobModel.job_type)
+                .all()
+            ):
+                depth[job_type] = depth.get(job_type, 0) + count
+            for job_type, count in (
+                db.query(JobModel.job_type, func.count())
+                .filter(JobModel.status.in_(("completed", "failed")), JobModel.updated_at >= since)
+                .group_by(JobModel.job_type)
+                .all()
+            ):
+                finished[job_type] = finished.get(job_type, 0) + count
+        finally:
+            db.close()
+    return depth, finished
+
+
+class Rejection(Exception):
+    """
+    Raised when a submission is not admitted; carries the suggested Retry-After.
+    """
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Decides whether a new job may be queued, based on the last sampled queue
+    depth and drain rate rather than a query per request.
+
+    The sample is refreshed in the background by `run_sampler`.
+    Jobs admitted since the last sample are counted locally so a burst between
+    samples is not invisible. Limits:
+
+    - total queued jobs above `max_queue_depth`, or an estimated drain time
+      above `max_drain_seconds`, rejects every submission;
+    - `job_type_limits` caps the queued jobs of individual types;
+    - `shed_job_types` are rejected early, once the estimated drain time
+      exceeds `shed_drain_seconds`.
+
+    Retry-After is the time needed to drain back under the exceeded limit at
+    the observed rate, clamped to [1, max_retry_after].
+    """
+
+    def __init__(
+        self,
+        sampler: Callable[[], QueueSample],
+        max_queue_depth: int = 10000,
+        max_drain_seconds: float = 600.0,
+        job_type_limits: Optional[Mapping[str, int]] = None,
+        shed_job_types: Iterable[str] = (),
+        shed_drain_seconds: float = 120.0,
+        rate_window: float = 60.0,
+        max_retry_after: int = 300,
+    ) -> None:
+        self.sampler = sampler
+        self.max_queue_depth = max_queue_depth
+        self.max_drain_seconds = max_drain_seconds
+        self.job_type_limits = dict(job_type_limits or {})
+        self.shed_job_types = frozenset(shed_job_types)
+        self.shed_drain_seconds = shed_drain_seconds
+        self.rate_window = rate_window
+        self.max_retry_after = max_retry_after
+
+        self._lock = threading.Lock()
+        self._depth: Dict[str, int] = {}
+        self._rate: Dict[str, float] = {}
+        self._total_depth = 0
+        self._total_rate = 0.0
+
+    def refresh(self) -> None:
+        """
+        Takes a new sample and replaces the cached depth/rate figures.
+        """
+        depth, finished = self.sampler()
+        rate = {jt: count / self.rate_window for jt, count in finished.items()}
+        with self._lock:
+            self._depth = dict(depth)
+            self._rate = rate
+            self._total_depth = sum(depth.values())
+            self._total_rate = sum(rate.values())
+
+    def drain_seconds(self, job_type: Optional[str] = None) -> float:
+        """
+        Estimated seconds to drain the whole queue (or one job_type's backlog).
+        """
+        depth = self._total_depth if job_type is None else self._depth.get(job_type, 0)
+        rate = self._total_rate if job_type is None else self._rate.get(job_type, 0.0)
+        if depth == 0:
+            return 0.0
+        return depth / rate if rate > 0 else math.inf
+
+    def _retry_after(self, excess: float, rate: float) -> int:
+        if rate <= 0:
+            return self.max_retry_after
+        return int(min(self.max_retry_after, max(1, math.ceil(excess / rate))))
+
+    def admit(self, job_type: str) -> None:
+        """
+        Admits a job or raises Rejection. Constant time; no I/O.
+        """
+        with self._lock:
+            total_depth, total_rate = self._total_depth, self._total_rate
+
+            if total_depth >= self.max_queue_depth:
+                raise Rejection(
+                    f"Queue is full ({total_depth} jobs waiting).",
+                    self._retry_after(total_depth - self.max_queue_depth + 1, total_rate),
+                )
+
+            drain = self.drain_seconds()
+            # Without any completions in the window the depth limit alone applies
+            if total_rate > 0 and drain > self.max_drain_seconds:
+                raise Rejection(
+                    f"Queue needs ~{int(drain)}s to drain.",
+                    self._retry_after(total_depth - self.max_drain_seconds * total_rate, total_rate),
+                )
+
+            if job_type in self.shed_job_types and total_rate > 0 and drain > self.shed_drain_seconds:
+                raise Rejection(
+                    f"Low-priority job type '{job_type}' is being shed while the queue drains.",
+                    self._retry_after(total_depth - self.shed_drain_seconds * total_rate, total_rate),
+                )
+
+            limit = self.job_type_limits.get(job_type)
+            type_depth = self._depth.get(job_type, 0)
+            if limit is not None and type_depth >= limit:
+                raise Rejection(
+                    f"Too many '{job_type}' jobs queued ({type_depth}).",
+                    self._retry_after(type_depth - limit + 1, self._rate.get(job_type, 0.0)),
+                )
+
+            # Count the admitted job until the next sample replaces the figures
+            self._depth[job_type] = type_depth + 1
+            self._total_depth = total_depth + 1
+
+    def run_sampler(self, interval: float, stop: threading.Event) -> None:
+        """
+        Refreshes the sample every `interval` seconds until `stop` is set.
+        """
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving with the last sample rather than failing requests
+                logger.warning("Admission control sample failed: %s", e)
+            stop.wait(max(0.0, interval - (time.perf_counter() - started)))
+
+
+@lru_cache(maxsize=None)
+def get_admission_controller() -> AdmissionController:
+    """
+    Returns the process-wide admission controller configured from settings.
+    """
+    return AdmissionController(
+        sampler=partial(sample_queue_from_db, settings.admission_rate_window),
+        max_queue_depth=settings.admission_max_queue_depth,
+        max_drain_seconds=settings.admission_max_drain_seconds,
+        job_type_limits=settings.admission_job_type_limits,
+        shed_job_types=settings.admission_shed_job_types,
+        shed_drain_seconds=settings.admission_shed_drain_seconds,
+        rate_window=settings.admission_rate_window,
+        max_retry_after=settings.admission_max_retry_after,
+    )
+
+
+def start_admission_sampler() -> threading.Event:
+    """
+    Starts the background sampler thread; set the returned event to stop it.
+    """
+    stop = threading.Event()
+    threading.Thread(
+        target=get_admission_controller().run_sampler,
+        args=(settings.admission_sample_interval, stop),
+        name="admission-sampler",
+        daemon=True,
+    ).start()
+    return stop
@@ -1,21 +1,50 @@
-from celery import Celery
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 from .settings import settings
 
-# Centralized Celery app for both API and Worker
-celery_app = Celery(
-    "async_jobs",
-    broker=settings.celery_broker_url,
-    backend=settings.celery_result_backend
-)
-
-# Global Celery configuration
-celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
-    timezone="UTC",
-    task_ack_late=True,
-)
-
-# optional: Load task modules automatically if you have many tasks
-celery_app.autodiscover_tasks(['src.worker.tasks'])
\ No newline at end of file
+if TYPE_CHECKING:
+    from celery import Celery
+
+
+@lru_cache(maxsize=None)
+def get_celery_app() -> "Celery":
+    """
+    Returns the centralized Celery app shared by the API and the worker.
+    Celery is imported and configured on first use so API processes that
+    only need it when a job is submitted do not pay for it at import time.
+    """
+    from celery import Celery
+    from .serialization import register_job_serializer
+
+    register_job_serializer(settings.celery_compression, settings.celery_compression_threshold)
+
+    app = Celery(
+        "async_jobs",
+        broker=settings.celery_broker_url,
+        backend=settings.celery_result_backend
+    )
+    if not settings.celery_store_results:
+        # With the "disabled" backend Celery neither stores task states/results nor
+        # subscribes to result channels when the API sends a task. It is set as the
+        # backend class because $CELERY_RESULT_BACKEND would override the config.
+        app.backend_cls = "disabled"
+
+    # Global Celery configuration
+    app.conf.update(
+        task_serializer=settings.celery_task_serializer,
+        accept_content=settings.celery_accept_content,
+        result_serializer=settings.celery_task_serializer,
+        result_accept_content=settings.celery_accept_content,
+        timezone="UTC",
+        task_ack_late=True,
+        task_ignore_result=not settings.celery_store_results,
+        result_expires=3600,
+    )
+    return app
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from .celery_app import celery_app` working without eager construction.
+    if name == "celery_app":
+        return get_celery_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,32 +1,95 @@
-from typing import Generator
+from functools import lru_cache
+from typing import Any, Callable, Dict, Generator, List, Sequence
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from .settings import settings
+from .ids import MAX_SHARDS, shard_of
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
-# SQLAlchemy database engine
-engine = create_engine(settings.database_url, pool_pre_ping=True)
-logger.info(f"Database engine initialized with URL: {settings.database_url}")
+# Base class for models
+Base: Any = declarative_base()
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Base class for models
-Base = declarative_base()
+def get_shard_urls() -> List[str]:
+    """
+    Returns the database URL of every shard, in shard-index order.
+    """
+    if len(settings.database_shard_urls) > MAX_SHARDS:
+        raise ValueError(f"At most {MAX_SHARDS} database shards are supported.")
+    return list(settings.database_shard_urls) or [settings.database_url]
+
+
+@lru_cache(maxsize=None)
+def get_shard_engine(shard: int) -> Engine:
+    """
+    Returns the process-wide SQLAlchemy engine of one shard, creating it on first use.
+    Deferring construction keeps imports cheap for processes (and tools like
+    the migration runner) that never touch the database through the ORM.
+    """
+    engine = create_engine(get_shard_urls()[shard], pool_pre_ping=True)
+    logger.info("Database engine for shard %s initialized for %s", shard,
+                engine.url.render_as_string(hide_password=True))
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_shard_session_factory(shard: int) -> sessionmaker:
+    """
+    Returns the session factory bound to one shard's lazily created engine.
+    """
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_shard_engine(shard))
 
-def get_db() -> Generator[Session, None, None]:
-    """ 
-    Dependency for FastAPI routes. 
-    Provides a database session and ensures it is properly closed after use. 
+
+class ShardSessions:
+    """
+    Sessions across all shards for one request, opened lazily on first use.
+    """
+
+    def __init__(self, factories: Sequence[Callable[[], Session]]) -> None:
+        self.factories = list(factories)
+        self._sessions: Dict[int, Session] = {}
+
+    def __len__(self) -> int:
+        return len(self.factories)
+
+    def for_shard(self, shard: int) -> Session:
+        if shard not in self._sessions:
+            self._sessions[shard] = self.factories[shard]()
+        return self._sessions[shard]
+
+    def for_job(self, job_id: int) -> Session:
+        """
+        Returns the session of the shard holding `job_id`. Raises LookupError
+        for ids that encode a shard this deployment does not have.
+        """
+        if len(self.factories) == 1:
+            return self.for_shard(0)
+        shard = shard_of(job_id)
+        if shard >= len(self.factories):
+            raise LookupError(f"Job id {job_id} belongs to unknown shard {shard}.")
+        return self.for_shard(shard)
+
+    def close(self) -> None:
+        for db in self._sessions.values():
+            db.close()
+        self._sessions.clear()
+
+
+def get_shard_sessions() -> Generator[ShardSessions, None, None]:
+    """
+    Dependency for FastAPI routes that reach jobs on any shard.
+    Sessions are opened only for the shards a request touches and are all
+    closed after use.
     """
-    db = SessionLocal()
+    sessions = ShardSessions([get_shard_session_factory(i) for i in range(len(get_shard_urls()))])
     try:
-        yield db
+        yield sessions
     except Exception as e:
-        logger.exception(f"Error during DB session lifecycle: {e}")
+        logger.exception("Error during DB session lifecycle: %s", e)
         raise
     finally:
-        db.close()
-        logger.debug("Database session closed")
\ No newline at end of file
+        sessions.close()
+        logger.debug("Database sessions closed")
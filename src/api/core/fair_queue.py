@@ -0,0 +1,113 @@
+from collections import deque
+from typing import Deque, Dict, Mapping, Optional, Set
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Redis keys used by the API (producer) and the fair dispatcher (consumer)
+TENANT_QUEUE_PREFIX = "fairq:tenant:"
+READY_TENANTS_KEY = "fairq:ready"
+# Jobs a dispatcher has taken from a sub-queue but not yet published to Celery
+INFLIGHT_PREFIX = "fairq:inflight:"
+
+DEFAULT_TENANT = "default"
+
+
+def tenant_queue_key(tenant: str) -> str:
+    """
+    Returns the Redis list holding queued job ids for a tenant.
+    """
+    return f"{TENANT_QUEUE_PREFIX}{tenant}"
+
+
+def enqueue_job(redis_client, tenant: str, job_id: int) -> int:
+    """
+    Appends a job to its tenant's sub-queue and returns the new backlog length.
+    When the sub-queue was empty the tenant is announced on the ready list so
+    the dispatcher puts it back into rotation.
+    """
+    backlog = int(redis_client.rpush(tenant_queue_key(tenant), job_id))
+    if backlog == 1:
+        redis_client.rpush(READY_TENANTS_KEY, tenant)
+    return backlog
+
+
+def tenant_backlog(redis_client, tenant: str) -> int:
+    """
+    Returns the number of jobs waiting in a tenant's sub-queue.
+    """
+    return int(redis_client.llen(tenant_queue_key(tenant)))
+
+
+class DeficitRoundRobin:
+    """
+    Deficit round robin over per-tenant sub-queues.
+
+    Active tenants sit in a ring. When a tenant reaches the head of the ring
+    it is granted `weight` credits, and each dispatch spends one credit; once
+    its credits run out the tenant moves to the back. Over time each backlogged
+    tenant receives a share of dispatches proportional to its weight, and
+    `select` does constant work however many tenants are active.
+
+    The scheduler only tracks which tenants have work. The caller pops a job
+    from the selected tenant's queue and calls `remove` if it turned out empty.
+    """
+
+    def __init__(self, weights: Optional[Mapping[str, int]] = None, default_weight: int = 1) -> None:
+        if default_weight < 1 or any(w < 1 for w in (weights or {}).values()):
+            raise ValueError("Tenant weights must be integers >= 1.")
+        self._weights: Dict[str, int] = dict(weights or {})
+        self._default_weight = default_weight
+        self._ring: Deque[str] = deque()
+        self._active: Set[str] = set()
+        self._deficit: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def weight(self, tenant: str) -> int:
+        return self._weights.get(tenant, self._default_weight)
+
+    def activate(self, tenant: str) -> None:
+        """
+        Adds a tenant with pending work to the back of the ring (no-op if active).
+        """
+        if tenant in self._active:
+            return
+        self._active.add(tenant)
+        self._deficit[tenant] = 0
+        self._ring.append(tenant)
+
+    def remove(self, tenant: str) -> None:
+        """
+        Drops a tenant whose sub-queue is empty; its unused credits are forfeited.
+        """
+        if tenant not in self._active:
+            return
+        # After select() the tenant is at the head (turn ongoing) or the tail (turn ended)
+        if self._ring[0] == tenant:
+            self._ring.popleft()
+        elif self._ring[-1] == tenant:
+            self._ring.pop()
+        else:
+            self._ring.remove(tenant)
+        self._active.discard(tenant)
+        del self._deficit[tenant]
+
+    def select(self) -> Optional[str]:
+        """
+        Returns the tenant that should be served next and charges it one credit,
+        or None when no tenant is active.
+        """
+        if not self._ring:
+            return None
+        tenant = self._ring[0]
+        if self._deficit[tenant] < 1:
+            # Start of this tenant's turn
+            self._deficit[tenant] += self.weight(tenant)
+        self._deficit[tenant] -= 1
+        if self._deficit[tenant] < 1:
+            # Turn over: move to the back of the ring
+            self._ring.rotate(-1)
+        return tenant
@@ -0,0 +1,233 @@
+import itertools
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Optional
+
+from .logging_config import get_logger
+from .settings import settings
+
+logger = get_logger(__name__)
+
+# Snowflake-style 53-bit job ids, so they stay exact as JSON numbers in JavaScript:
+#   [37 bits of 10ms ticks since EPOCH_MS][5 bits shard][6 bits node][5 bits sequence]
+# The shard is encoded in the id so a job's database can be found without a lookup.
+# 37 bits of 10ms ticks last until 2069.
+EPOCH_MS = 1767225600000  # 2026-01-01T00:00:00Z
+TICK_MS = 10
+SEQUENCE_BITS = 5
+NODE_BITS = 6
+SHARD_BITS = 5
+
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+MAX_NODE = (1 << NODE_BITS) - 1
+MAX_SHARDS = 1 << SHARD_BITS
+
+NODE_SHIFT = SEQUENCE_BITS
+SHARD_SHIFT = SEQUENCE_BITS + NODE_BITS
+TIMESTAMP_SHIFT = SEQUENCE_BITS + NODE_BITS + SHARD_BITS
+
+# Ids issued by the old 32-bit serial primary key all live on shard 0. Generated
+# ids are never this small: the timestamp part alone exceeds it ~5.5 minutes after EPOCH_MS.
+LEGACY_ID_LIMIT = 1 << 31
+
+
+def shard_of(job_id: int) -> int:
+    """
+    Returns the shard index encoded in a job id.
+    """
+    if job_id < LEGACY_ID_LIMIT:
+        return 0
+    return (job_id >> SHARD_SHIFT) & (MAX_SHARDS - 1)
+
+
+def _current_tick() -> int:
+    return (int(time.time() * 1000) - EPOCH_MS) // TICK_MS
+
+
+class SnowflakeIdGenerator:
+    """
+    Generates time-ordered, shard-encoded job ids. Ids are unique across
+    processes as long as each process uses a distinct node id; each node can
+    issue 32 ids per 10ms tick (3200/s) before waiting for the next one.
+    """
+
+    def __init__(self, node_id: int, lease: Optional["NodeLease"] = None) -> None:
+        if not 0 <= node_id <= MAX_NODE:
+            raise ValueError(f"node_id must be between 0 and {MAX_NODE}.")
+        self.node_id = node_id
+        # When set, the node id comes from the lease and ids are only issued while it is held
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._last_tick = -1
+        self._sequence = 0
+
+    def next_id(self, shard: int) -> int:
+        if not 0 <= shard < MAX_SHARDS:
+            raise ValueError(f"shard must be between 0 and {MAX_SHARDS - 1}.")
+        with self._lock:
+            if self.lease is not None:
+                if not self.lease.valid or self.lease.node_id is None:
+                    raise RuntimeError("The job id node lease has expired; refusing to issue ids.")
+                self.node_id = self.lease.node_id
+            tick = _current_tick()
+            if tick < self._last_tick:
+                # Clock moved backwards: keep issuing from the last tick
+                tick = self._last_tick
+            if tick == self._last_tick:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # Sequence exhausted for this tick; wait for the next one
+                    while tick <= self._last_tick:
+                        time.sleep(TICK_MS / 1000 / 4)
+                        tick = _current_tick()
+            else:
+                self._sequence = 0
+            self._last_tick = tick
+            return (
+                (tick << TIMESTAMP_SHIFT)
+                | (shard << SHARD_SHIFT)
+                | (self.node_id << NODE_SHIFT)
+                | self._sequence
+            )
+
+
+NODE_LEASE_PREFIX = "jobs:node:"
+
+# Compare-and-set scripts, so a process never extends or frees another's lease
+_REFRESH_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class NodeLease:
+    """
+    Exclusive lease on one node id, held in Redis as `jobs:node:<n>` (SET NX EX)
+    and refreshed by a heartbeat thread. The lease counts as held only until
+    `ttl` seconds after the last successful claim or refresh (measured from
+    before the command was sent), so a process that stalls past its TTL stops
+    issuing ids before another process can take the same node id.
+    """
+
+    def __init__(self, client: Any, ttl: int = 30) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.token = uuid.uuid4().hex
+        self.node_id: Optional[int] = None
+        self._valid_until = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def valid(self) -> bool:
+        return time.monotonic() < self._valid_until
+
+    def _key(self, node_id: int) -> str:
+        return f"{NODE_LEASE_PREFIX}{node_id}"
+
+    def acquire(self) -> int:
+        """
+        Claims the first free node id. Raises RuntimeError when all are leased.
+        """
+        for node_id in range(MAX_NODE + 1):
+            started = time.monotonic()
+            if self.client.set(self._key(node_id), self.token, nx=True, ex=self.ttl):
+                self.node_id = node_id
+                self._valid_until = started + self.ttl
+                logger.info("Leased job id node id %s", node_id)
+                return node_id
+        raise RuntimeError(f"All {MAX_NODE + 1} job id node ids are leased by running processes.")
+
+    def refresh(self) -> bool:
+        """
+        Extends the lease; returns False if it was lost (expired and taken, or freed).
+        """
+        if self.node_id is None:
+            return False
+        started = time.monotonic()
+        if self.client.eval(_REFRESH_LEASE, 1, self._key(self.node_id), self.token, self.ttl):
+            self._valid_until = started + self.ttl
+            return True
+        return False
+
+    def heartbeat_once(self) -> None:
+        """
+        Refreshes the lease, or claims a new node id if it was lost.
+        """
+        try:
+            if not self.refresh():
+                logger.error("Lost the lease on job id node id %s; claiming another.", self.node_id)
+                self._valid_until = 0.0
+                self.acquire()
+        except Exception as e:
+            # Ids stop being issued once the lease runs out; keep trying meanwhile
+            logger.warning("Could not refresh the job id node lease: %s", e)
+
+    def start_heartbeat(self) -> None:
+        def run() -> None:
+            while not self._stop.wait(self.ttl / 3):
+                self.heartbeat_once()
+
+        self._thread = threading.Thread(target=run, name="node-lease-heartbeat", daemon=True)
+        self._thread.start()
+
+    def release(self) -> None:
+        self._stop.set()
+        if self.node_id is not None:
+            self.client.eval(_RELEASE_LEASE, 1, self._key(self.node_id), self.token)
+            self._valid_until = 0.0
+
+
+@lru_cache(maxsize=None)
+def get_id_generator() -> SnowflakeIdGenerator:
+    """
+    Returns the process-wide id generator. Its node id is leased from Redis and
+    kept by a heartbeat; NODE_ID skips the lease (it must then be unique per
+    process, not per container).
+    """
+    if settings.node_id is not None:
+        logger.info("Job id generator using node id %s", settings.node_id)
+        return SnowflakeIdGenerator(settings.node_id)
+
+    from .redis_config import redis_client
+    lease = NodeLease(redis_client, ttl=settings.node_lease_ttl)
+    node_id = lease.acquire()
+    lease.start_heartbeat()
+    return SnowflakeIdGenerator(node_id, lease=lease)
+
+
+def release_node_lease() -> None:
+    """
+    Frees this process's node id lease, if it took one, e.g. at shutdown.
+    """
+    if get_id_generator.cache_info().currsize:
+        lease = get_id_generator().lease
+        if lease is not None:
+            lease.release()
+
+
+_next_shard = itertools.count()
+
+
+def pick_shard(shard_count: int) -> int:
+    """
+    Chooses the shard for a new job (round robin across shards).
+    """
+    return next(_next_shard) % shard_count
+
+
+def new_job_id(*, shard: int = 0) -> int:
+    """
+    Returns a new job id on the given shard.
+    """
+    return get_id_generator().next_id(shard)
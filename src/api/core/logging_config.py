@@ -1,31 +1,114 @@
+import atexit
+import json
 import logging
-from logging import StreamHandler, Logger, Formatter
+import os
+import queue
+from logging import StreamHandler, Logger, Formatter, LogRecord
+from logging.handlers import QueueHandler, QueueListener
 import sys
-from typing import Optional, Union
+from typing import Any, Dict, Mapping, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
 try:
     from pythonjsonlogger import jsonlogger
 except ImportError:
     jsonlogger = None  # type: ignore
 
+# Listener draining the log queue when async logging is enabled
+_listener: Optional[QueueListener] = None
+
+
+class OrjsonFormatter(Formatter):
+    """
+    JSON formatter backed by orjson; emits the same fields as the
+    python-json-logger format used before (asctime, levelname, name, message).
+    """
+
+    def format(self, record: LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "asctime": self.formatTime(record, self.datefmt),
+            "levelname": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
 
-def setup_logging(level: str = "INFO", json_logs: bool = False) -> None:
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in every `1 / rate` records per message template for records at
+    INFO level or below; warnings and errors always pass. Counting per template
+    (the un-formatted `record.msg`) keeps rare messages visible on a busy logger.
+    """
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counts: Dict[Any, int] = {}
+
+    def filter(self, record: LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        if self.every == 0:
+            return False
+        count = self._counts.get(record.msg, 0)
+        self._counts[record.msg] = count + 1
+        return count % self.every == 0
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records untouched. The stock `prepare()` formats
+    the message and traceback in the logging thread; with an in-process queue
+    the listener can do all formatting instead, producing the same output as
+    synchronous logging.
+    """
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        return record
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(
+    level: str = "INFO",
+    json_logs: bool = False,
+    async_logs: bool = False,
+    sample_rates: Optional[Mapping[str, float]] = None,
+) -> None:
     """
     Configures global logging format, level, and handler.
-    If json_logs=True, uses JSON formatter (requires python-json-logger).
+    If json_logs=True, uses a JSON formatter (orjson, else python-json-logger).
+    If async_logs=True, records are handed to a queue and formatted and written to
+    stdout by a background thread, so callers never block on stdout back-pressure.
+    `sample_rates` maps logger names to the fraction of INFO/DEBUG records kept.
     """
 
     root_logger: Logger = logging.getLogger()
     root_logger.setLevel(level.upper())
 
     # Remove existing handlers (avoid duplicate logs if setup_logging is called multiple times)
+    _stop_listener()
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
 
     handler: StreamHandler = StreamHandler(sys.stdout)
 
-    if json_logs and jsonlogger is not None:
-        formatter: Union[Formatter, "jsonlogger.JsonFormatter"] = jsonlogger.JsonFormatter(
+    if json_logs and orjson is not None:
+        formatter: Union[Formatter, "jsonlogger.JsonFormatter"] = OrjsonFormatter(datefmt="%Y-%m-%d %H:%M:%S")
+    elif json_logs and jsonlogger is not None:
+        formatter = jsonlogger.JsonFormatter(
             fmt="%(asctime)s %(levelname)s %(name)s %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
@@ -36,11 +119,42 @@ def setup_logging(level: str = "INFO", json_logs: bool = False) -> None:
         )
 
     handler.setFormatter(formatter)
-    root_logger.addHandler(handler)
+
+    if async_logs:
+        global _listener
+        log_queue: "queue.SimpleQueue[LogRecord]" = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        root_logger.addHandler(DeferredQueueHandler(log_queue))
+    else:
+        root_logger.addHandler(handler)
+
+    for name, rate in (sample_rates or {}).items():
+        sampled_logger = logging.getLogger(name)
+        sampled_logger.filters = [f for f in sampled_logger.filters if not isinstance(f, SamplingFilter)]
+        if rate < 1:
+            sampled_logger.addFilter(SamplingFilter(rate))
+
+
+def setup_logging_from_env() -> None:
+    """
+    Configures logging from LOG_LEVEL, JSON_LOGS, ASYNC_LOGS and LOG_SAMPLE_RATES
+    (a JSON map such as {"src.api.routers.jobs": 0.01}).
+    """
+    setup_logging(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        json_logs=os.getenv("JSON_LOGS", "false").lower() == "true",
+        async_logs=os.getenv("ASYNC_LOGS", "false").lower() == "true",
+        sample_rates=json.loads(os.getenv("LOG_SAMPLE_RATES", "{}")),
+    )
 
 
 def get_logger(name: str) -> Logger:
     """
     Returns a logger with the given module name.
     """
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
+
+
+# Flush queued records on interpreter exit
+atexit.register(_stop_listener)
@@ -0,0 +1,91 @@
+import argparse
+import os
+from typing import List, Optional
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.engine import make_url
+
+from .database import get_shard_urls
+from .logging_config import setup_logging_from_env, get_logger
+
+logger = get_logger(__name__)
+
+# Alembic environment lives next to the application code so it ships in the image
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "migrations")
+
+
+def get_alembic_config(database_url: Optional[str] = None) -> Config:
+    """
+    Builds an Alembic config programmatically (no alembic.ini required).
+    """
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    # '%' must be escaped for configparser interpolation (e.g. URL-encoded passwords)
+    config.set_main_option("sqlalchemy.url", (database_url or get_shard_urls()[0]).replace("%", "%%"))
+    return config
+
+
+def upgrade(revision: str = "head", database_url: Optional[str] = None) -> None:
+    """
+    Applies all migrations up to the given revision, on `database_url` or else
+    on every shard.
+    """
+    for url in [database_url] if database_url else get_shard_urls():
+        logger.info("Applying database migrations up to '%s' on %s ...", revision,
+                    make_url(url).render_as_string(hide_password=True))
+        command.upgrade(get_alembic_config(url), revision)
+    logger.info("Database schema is at '%s'.", revision)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Explicit migration entry point, run once per deploy before the API and workers start.
+    upgrade, downgrade, current and stamp apply to every shard in turn:
+
+        python -m src.api.core.migrations upgrade [revision]
+        python -m src.api.core.migrations downgrade <revision>
+        python -m src.api.core.migrations revision -m "message" [--autogenerate]
+        python -m src.api.core.migrations current
+        python -m src.api.core.migrations stamp <revision>
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.api.core.migrations")
+    sub = parser.add_subparsers(dest="command")
+
+    upgrade_parser = sub.add_parser("upgrade", help="Upgrade the schema (default: head)")
+    upgrade_parser.add_argument("revision", nargs="?", default="head")
+
+    downgrade_parser = sub.add_parser("downgrade", help="Downgrade the schema")
+    downgrade_parser.add_argument("revision")
+
+    revision_parser = sub.add_parser("revision", help="Create a new migration script")
+    revision_parser.add_argument("-m", "--message", required=True)
+    revision_parser.add_argument("--autogenerate", action="store_true")
+
+    sub.add_parser("current", help="Show the current revision")
+
+    stamp_parser = sub.add_parser("stamp", help="Mark the schema as being at a revision without running it")
+    stamp_parser.add_argument("revision")
+
+    args = parser.parse_args(argv)
+    setup_logging_from_env()
+
+    if args.command in (None, "upgrade"):
+        upgrade(getattr(args, "revision", "head"))
+    elif args.command == "revision":
+        # Shards share one schema; autogenerate compares against the first
+        command.revision(get_alembic_config(), message=args.message, autogenerate=args.autogenerate)
+    else:
+        for shard, url in enumerate(get_shard_urls()):
+            config = get_alembic_config(url)
+            if args.command == "downgrade":
+                command.downgrade(config, args.revision)
+            elif args.command == "current":
+                logger.info("Shard %s:", shard)
+                command.current(config, verbose=True)
+            elif args.command == "stamp":
+                command.stamp(config, args.revision)
+
+
+if __name__ == "__main__":
+    main()
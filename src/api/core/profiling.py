@@ -0,0 +1,203 @@
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, Iterable, List, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class PhaseTimer:
+    """
+    Collects wall-clock milliseconds per named phase of one job or request.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000)
+
+    def add(self, name: str, ms: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + ms
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Whole milliseconds per phase, for storing alongside the job.
+        """
+        return {name: int(round(ms)) for name, ms in self.phases.items()}
+
+
+class RequestStartMiddleware:
+    """
+    Pure ASGI middleware that stamps each HTTP request with its start time
+    (request.state.started), so handlers can attribute the time spent before
+    they run (body parsing, validation, dependencies).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["started"] = time.perf_counter()
+        await self.app(scope, receive, send)
+
+
+def request_timer(request: Any) -> PhaseTimer:
+    """
+    Returns a PhaseTimer for a request, pre-filled with its "validation" phase
+    when RequestStartMiddleware is installed.
+    """
+    timer = PhaseTimer()
+    started = getattr(getattr(request, "state", None), "started", None)
+    if started is not None:
+        timer.add("validation", (time.perf_counter() - started) * 1000)
+    return timer
+
+
+class TimingStats:
+    """
+    Thread-safe, in-process aggregate of phase timings per operation
+    (job_type for jobs, endpoint for API requests).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (operation, phase) -> [count, total_ms, max_ms]
+        self._stats: Dict[tuple, List[float]] = {}
+
+    def record(self, operation: str, phases: Dict[str, float]) -> None:
+        with self._lock:
+            for phase, ms in phases.items():
+                entry = self._stats.setdefault((operation, phase), [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += ms
+                entry[2] = max(entry[2], ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        with self._lock:
+            items = [(key, list(value)) for key, value in self._stats.items()]
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (operation, phase), (count, total, peak) in items:
+            result.setdefault(operation, {})[phase] = {
+                "count": int(count),
+                "mean_ms": round(total / count, 3),
+                "max_ms": round(peak, 3),
+                "total_ms": round(total, 3),
+            }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+class StackSampler:
+    """
+    Statistical profiler: samples the Python stacks of running threads every
+    `interval` seconds and counts them in collapsed form ("frame;frame;frame N"),
+    which flamegraph.pl, speedscope and inferno read directly.
+
+    Threads can be tagged with a label (e.g. the job_type they are running) so a
+    profile can be restricted to work of one kind.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._labels: Dict[int, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._last_profile: Optional[str] = None
+
+    @contextmanager
+    def label(self, value: str) -> Generator[None, None, None]:
+        """
+        Tags the current thread with `value` while the block runs.
+        """
+        ident = threading.get_ident()
+        self._labels[ident] = value
+        try:
+            yield
+        finally:
+            self._labels.pop(ident, None)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def sample(self, seconds: float, interval: float = 0.005, label: Optional[str] = None) -> str:
+        """
+        Samples for `seconds` in the calling thread and returns the collapsed stacks.
+        """
+        own = threading.get_ident()
+        counts: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if label is not None and self._labels.get(ident) != label:
+                    continue
+                counts[self._collapse(frame)] += 1
+            time.sleep(interval)
+        return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+
+    def start(self, seconds: float, interval: float = 0.005, label: Optional[str] = None) -> bool:
+        """
+        Samples in a background thread; the result is available from `last_profile`.
+        Returns False if a profile is already running.
+        """
+        with self._lock:
+            if self.running:
+                return False
+
+            def run() -> None:
+                self._last_profile = self.sample(seconds, interval, label)
+                logger.info("Profile finished (%ss, label=%s).", seconds, label)
+
+            self._last_profile = None
+            self._thread = threading.Thread(target=run, name="stack-sampler", daemon=True)
+            self._thread.start()
+            return True
+
+    @property
+    def last_profile(self) -> Optional[str]:
+        return self._last_profile
+
+
+def merge_collapsed(profiles: Iterable[str]) -> str:
+    """
+    Sums several collapsed-stack dumps (e.g. from multiple workers) into one.
+    """
+    counts: Counter = Counter()
+    for profile in profiles:
+        for line in profile.splitlines():
+            stack, _, count = line.rpartition(" ")
+            if stack:
+                counts[stack] += int(count)
+    return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+
+
+# Process-wide instances shared by the API and worker code
+api_timings = TimingStats()
+job_timings = TimingStats()
+sampler = StackSampler()
@@ -0,0 +1,109 @@
+from typing import Any, Callable, Dict, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Name and content type under which the serializer is registered with kombu
+SERIALIZER_NAME = "msgpack-z"
+CONTENT_TYPE = "application/x-msgpack-z"
+
+# One-byte frame header describing how the msgpack body is compressed
+_FLAG_RAW = b"\x00"
+_FLAG_ZSTD = b"\x01"
+_FLAG_LZ4 = b"\x02"
+
+
+def _zstd_codec() -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    compressor = zstandard.ZstdCompressor(level=3)
+    decompressor = zstandard.ZstdDecompressor()
+    return compressor.compress, decompressor.decompress
+
+
+def _lz4_codec() -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    return lz4_frame.compress, lz4_frame.decompress
+
+
+def _available_codecs() -> Dict[bytes, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    codecs = {}
+    if zstandard is not None:
+        codecs[_FLAG_ZSTD] = _zstd_codec()
+    if lz4_frame is not None:
+        codecs[_FLAG_LZ4] = _lz4_codec()
+    return codecs
+
+
+_COMPRESSION_FLAGS = {"zstd": _FLAG_ZSTD, "lz4": _FLAG_LZ4}
+
+
+def make_codec(
+    compression: str = "zstd",
+    threshold: int = 1024,
+) -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    """
+    Returns an (encode, decode) pair for msgpack bodies that are compressed
+    with zstd or lz4 once the packed size reaches `threshold` bytes.
+    Small messages stay uncompressed, where the codec overhead is not worth it.
+    """
+    if msgpack is None:
+        raise RuntimeError(f"The '{SERIALIZER_NAME}' serializer requires the msgpack package.")
+
+    codecs = _available_codecs()
+    flag = _COMPRESSION_FLAGS.get(compression.lower()) if compression else None
+    if compression and compression.lower() != "none" and flag not in codecs:
+        logger.warning("Compression '%s' is unavailable; task messages will not be compressed.", compression)
+        flag = None
+    compressor = (flag, codecs[flag][0]) if flag is not None else None
+
+    def encode(obj: Any) -> bytes:
+        packed: bytes = msgpack.packb(obj, use_bin_type=True)
+        if compressor is not None and len(packed) >= threshold:
+            compressed_flag, compress = compressor
+            return compressed_flag + compress(packed)
+        return _FLAG_RAW + packed
+
+    def decode(data: bytes) -> Any:
+        if isinstance(data, str):
+            data = data.encode("latin-1")
+        header, body = data[:1], data[1:]
+        if header != _FLAG_RAW:
+            if header not in codecs:
+                raise ValueError(f"Unsupported compression flag {header!r} in '{SERIALIZER_NAME}' message.")
+            body = codecs[header][1](body)
+        return msgpack.unpackb(body, raw=False)
+
+    return encode, decode
+
+
+def register_job_serializer(compression: str = "zstd", threshold: int = 1024) -> None:
+    """
+    Registers the compact serializer with kombu so Celery can use it for
+    `task_serializer`/`result_serializer` and accept it in `accept_content`.
+    Decoding is selected per message from its content type, so JSON and
+    msgpack-z messages can share a queue during a rolling upgrade.
+    """
+    from kombu.serialization import register
+
+    encode, decode = make_codec(compression, threshold)
+    register(
+        SERIALIZER_NAME,
+        encode,
+        decode,
+        content_type=CONTENT_TYPE,
+        content_encoding="binary",
+    )
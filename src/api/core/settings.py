@@ -1,16 +1,70 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # Database
     database_url: str = "postgresql://user:password@db:5432/jobs_db"
+    # Horizontal sharding: one URL per shard, in a fixed order (a job's shard index
+    # is encoded in its id, so never reorder or remove entries, only append).
+    # Empty means a single shard at `database_url`.
+    database_shard_urls: list[str] = []
+    # Node id (0-63) of this process in generated job ids. Leave unset to lease a
+    # free one in Redis at startup (kept alive by a heartbeat, expiring after
+    # `node_lease_ttl` seconds); if set, it must differ for every process
+    # (including each uvicorn worker) that submits jobs.
+    node_id: Optional[int] = None
+    node_lease_ttl: int = 30
 
     # Celery/Redis
     celery_broker_url: str = "redis://redis:6379/0"
     celery_result_backend: str = "redis://redis:6379/0"
+    # Job state and results live in the jobs table; the result backend is only
+    # used when this is enabled, and its entries then expire after an hour.
+    celery_store_results: bool = False
+
+    # Task message serialization. "msgpack-z" is msgpack with zstd/lz4 compression
+    # above the threshold; keep "json" until every worker accepts msgpack-z.
+    celery_task_serializer: str = "json"
+    celery_accept_content: list[str] = ["json", "msgpack-z"]
+    celery_compression: str = "zstd"
+    celery_compression_threshold: int = 1024
 
     # Redis (if you use it directly, not just as broker)
     redis_url: str = "redis://redis:6379/0"
 
+    # Weighted fair queuing across tenants. When enabled the API queues jobs in
+    # per-tenant Redis lists and the fair dispatcher feeds `job_queue` from them.
+    fair_scheduling: bool = False
+    fair_queue_weights: dict[str, int] = {}
+    fair_queue_default_weight: int = 1
+    # Max jobs waiting per tenant (0 = unlimited); per-tenant overrides below
+    fair_queue_default_quota: int = 0
+    fair_queue_quotas: dict[str, int] = {}
+    # Max messages the dispatcher keeps in `job_queue` ahead of the workers
+    fair_dispatch_window: int = 50
+    # Names the dispatcher's in-flight list; keep it stable across restarts so
+    # jobs taken but not yet published before a crash are recovered
+    fair_dispatcher_id: str = "default"
+
+    # Admission control on POST /jobs/submit. Queue depth and drain rate are
+    # sampled from the jobs table every `admission_sample_interval` seconds.
+    admission_control: bool = False
+    admission_sample_interval: float = 2.0
+    admission_rate_window: float = 60.0
+    admission_max_queue_depth: int = 10000
+    admission_max_drain_seconds: float = 600.0
+    admission_job_type_limits: dict[str, int] = {}
+    # Low-priority job types rejected first, once the drain time passes the shed threshold
+    admission_shed_job_types: list[str] = []
+    admission_shed_drain_seconds: float = 120.0
+    admission_max_retry_after: int = 300
+
+    # Admin endpoints (/admin): phase timings and on-demand profiling
+    admin_api_enabled: bool = False
+    admin_broadcast_timeout: float = 2.0
+    profile_max_seconds: float = 60.0
+
     class Config: 
         env_file = ".env" # optional, supports overrides
         env_file_encoding = 'utf-8'
@@ -1,21 +1,18 @@
-import os
-
 from fastapi import FastAPI, Request
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from .routers import jobs
-from .core.database import Base, engine
-from .core.logging_config import setup_logging, get_logger
-from .models.sql_models import job
+from .routers import admin, jobs
+from .core.admission import start_admission_sampler
+from .core.ids import get_id_generator, release_node_lease
+from .core.logging_config import setup_logging_from_env, get_logger
+from .core.profiling import RequestStartMiddleware
+from .core.settings import settings
 
 templates = Jinja2Templates(directory="src/api/templates")
 
 # Setup global logging
-setup_logging(
-    level=os.getenv("LOG_LEVEL", "INFO"),
-    json_logs=os.getenv("JSON_LOGS", "false").lower() == "true"
-)
+setup_logging_from_env()
 logger = get_logger(__name__)
 
 app = FastAPI(
@@ -28,13 +25,28 @@ app = FastAPI(
 # We map it to a directory named 'static' (which we will create soon)
 app.mount("/static", StaticFiles(directory="src/api/static"), name="static")
 
-# This startup event handler is the correct way to ensure the database
-# tables are created only once when the application starts.
+# Stamps request start times so handlers can report per-phase timings
+app.add_middleware(RequestStartMiddleware)
+
+# The schema is managed by migrations (python -m src.api.core.migrations upgrade),
+# which run once per deploy instead of on every API process start.
+
 @app.on_event("startup")
 async def startup_event():
-    logger.info("Connecting to database and creating tables...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created or already exist.")
+    # Lease this process's node id for job ids now, so a missing Redis or no free
+    # node id fails the start
+    get_id_generator()
+    if settings.admission_control:
+        app.state.admission_sampler_stop = start_admission_sampler()
+        logger.info("Admission control enabled; sampling queue depth in the background.")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    release_node_lease()
+    stop = getattr(app.state, "admission_sampler_stop", None)
+    if stop is not None:
+        stop.set()
 
 @app.get("/")
 def serve_dashboard(request: Request):
@@ -48,4 +60,5 @@ def serve_dashboard(request: Request):
 
 
 # Include the routers
-app.include_router(jobs.router)
\ No newline at end of file
+app.include_router(jobs.router)
+app.include_router(admin.router)
\ No newline at end of file
@@ -25,6 +25,13 @@ class JobBase(BaseModel):
         description="Payload data",
         json_schema_extra={"example": {"input_data": 100}},
     )
+    tenant: str = Field(
+        default="default",
+        min_length=1,
+        max_length=64,
+        description="Tenant/owner the job is scheduled fairly against",
+        json_schema_extra={"example": "acme"},
+    )
 
 
 class JobCreate(JobBase):
@@ -44,6 +51,11 @@ class JobDBBase(BaseModel):
         description="Type of job",
         json_schema_extra={"example": "Data Analysis"},
     )
+    tenant: str = Field(
+        default="default",
+        description="Tenant/owner of the job",
+        json_schema_extra={"example": "acme"},
+    )
     status: JobStatus = Field(
         default=JobStatus.QUEUED,
         description="Current status",
@@ -72,6 +84,11 @@ class JobDBBase(BaseModel):
         description="Error message, string or structured dict",
         json_schema_extra={"example": {"error": "Database error"}},
     )
+    timings: Optional[Dict[str, int]] = Field(
+        default=None,
+        description="Milliseconds spent per processing phase",
+        json_schema_extra={"example": {"queue_wait": 120, "claim": 2, "handler": 2003}},
+    )
 
     class Config:
         from_attributes = True
@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Enum
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.types import TypeDecorator, JSON
 from sqlalchemy.orm import relationship
@@ -7,11 +7,14 @@ from sqlalchemy import inspect
 from sqlalchemy.ext.mutable import MutableDict
 
 from ...core.database import Base
+from ...core.ids import new_job_id
 
 
 class JSONType(TypeDecorator):
     """Custom JSON type that uses JSONB for PostgreSQL and JSON for others."""
     impl = JSON
+    # Stateless, so statements using it can be served from SQLAlchemy's compiled cache
+    cache_ok = True
 
     def load_dialect_impl(self, dialect):
         if dialect.name == 'postgresql':
@@ -29,9 +32,18 @@ class JSONType(TypeDecorator):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Serve the admission-control sampler: queue depth per status and type,
+        # and jobs finished per status within the recent rate window
+        Index("ix_jobs_status_job_type", "status", "job_type"),
+        Index("ix_jobs_status_updated_at", "status", "updated_at"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # Snowflake-style id encoding the shard the row lives on; the API passes the
+    # id for the chosen shard, the default is only for rows created on shard 0
+    id = Column(BigInteger, primary_key=True, index=True, autoincrement=False, default=new_job_id)
     job_type = Column(String, nullable=False)
+    tenant = Column(String, nullable=False, default="default", server_default="default", index=True)
     payload = Column(JSONType(), nullable=False)
     # store textual enum (portable across SQLite and Postgres)
     status = Column(
@@ -43,4 +55,6 @@ class Job(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     result = Column(JSONType(), nullable=True)
-    error_message = Column(JSONType(), nullable=True)
\ No newline at end of file
+    error_message = Column(JSONType(), nullable=True)
+    # Milliseconds per processing phase of the last attempt, e.g. {"queue_wait": 120, "claim": 2, "handler": 2003}
+    timings = Column(JSONType(), nullable=True)
\ No newline at end of file
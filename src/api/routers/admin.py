@@ -0,0 +1,92 @@
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from ..core.celery_app import get_celery_app
+from ..core.logging_config import get_logger
+from ..core.profiling import api_timings, merge_collapsed, sampler
+from ..core.settings import settings
+
+logger = get_logger(__name__)
+
+
+def require_admin_api() -> None:
+    """
+    Hides the admin endpoints unless ADMIN_API_ENABLED is set.
+    """
+    if not settings.admin_api_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_api)]
+)
+
+
+def _broadcast(command: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    replies = get_celery_app().control.broadcast(
+        command, arguments=arguments or {}, reply=True, timeout=settings.admin_broadcast_timeout
+    )
+    # Each reply is {worker_hostname: result}
+    return {worker: result for reply in replies or [] for worker, result in reply.items()}
+
+
+@router.get(
+    "/timings",
+    summary="Aggregated phase timings of API requests handled by this process"
+)
+async def get_api_timings() -> Dict[str, Any]:
+    return api_timings.snapshot()
+
+
+@router.get(
+    "/profile",
+    response_class=PlainTextResponse,
+    summary="Sample this API process for N seconds and return collapsed stacks (flamegraph input)"
+)
+async def profile_api(
+    seconds: float = Query(default=10.0, gt=0),
+    # Bounded below so a tiny interval cannot turn the sampler into a busy loop
+    interval: float = Query(default=0.005, ge=0.001),
+) -> PlainTextResponse:
+    seconds = min(seconds, settings.profile_max_seconds)
+    logger.info("Profiling API process for %ss", seconds)
+    profile: str = await run_in_threadpool(sampler.sample, seconds, interval)
+    return PlainTextResponse(profile)
+
+
+@router.get(
+    "/workers/timings",
+    summary="Aggregated phase timings per job_type, per worker"
+)
+async def get_worker_timings() -> Dict[str, Any]:
+    return await run_in_threadpool(_broadcast, "job_timings_stats")
+
+
+@router.post(
+    "/workers/profile",
+    summary="Start sampling workers for N seconds, optionally only while one job_type runs"
+)
+async def start_worker_profile(
+    seconds: float = Query(default=10.0, gt=0),
+    job_type: Optional[str] = None,
+) -> Dict[str, Any]:
+    seconds = min(seconds, settings.profile_max_seconds)
+    logger.info("Starting worker profile for %ss (job_type=%s)", seconds, job_type)
+    return await run_in_threadpool(_broadcast, "profile_start", {"seconds": seconds, "job_type": job_type})
+
+
+@router.get(
+    "/workers/profile",
+    response_class=PlainTextResponse,
+    summary="Merged collapsed stacks of the last finished profile on every worker"
+)
+async def get_worker_profile() -> PlainTextResponse:
+    replies = await run_in_threadpool(_broadcast, "profile_dump")
+    if any(reply.get("running") for reply in replies.values()):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A worker profile is still running.")
+    return PlainTextResponse(merge_collapsed(reply.get("profile") or "" for reply in replies.values()))
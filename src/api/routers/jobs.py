@@ -1,5 +1,8 @@
+import asyncio
+import heapq
+import itertools
+from contextlib import nullcontext
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
 from typing import List, Optional
 from starlette.concurrency import run_in_threadpool
 from datetime import datetime
@@ -11,9 +14,15 @@ from src.api.models.job import (
     JobStatusResponse,
 )
 from ..models.sql_models.job import Job as JobModel
-from ..core.database import get_db
-from ..core.celery_app import celery_app
+from ..core.database import ShardSessions, get_shard_sessions
+from ..core.admission import Rejection, get_admission_controller
+from ..core.celery_app import get_celery_app
+from ..core.fair_queue import enqueue_job, tenant_backlog
+from ..core.ids import new_job_id, pick_shard
 from ..core.logging_config import get_logger
+from ..core.profiling import PhaseTimer, api_timings, request_timer
+from ..core.redis_config import redis_client
+from ..core.settings import settings
 
 logger = get_logger(__name__)
 
@@ -31,31 +40,66 @@ router = APIRouter(
 )
 async def submit_job(
     job_data: JobCreate,
-    db: Session = Depends(get_db),
+    shards: ShardSessions = Depends(get_shard_sessions),
     request: Request = None
 ) -> JobSubmitResponse:
+    timer = request_timer(request)
     client_host: str = getattr(getattr(request, "client", None), "host", "unknown")
-    logger.info(f"Received new job submission request from {client_host}: type={job_data.job_type}")
+    logger.info(
+        "Received new job submission request from %s: type=%s, tenant=%s",
+        client_host, job_data.job_type, job_data.tenant
+    )
+
+    if settings.admission_control:
+        try:
+            get_admission_controller().admit(job_data.job_type)
+        except Rejection as rejection:
+            logger.warning("Rejected '%s' job from %s: %s", job_data.job_type, client_host, rejection.reason)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=rejection.reason,
+                headers={"Retry-After": str(rejection.retry_after)}
+            )
 
-    def submit_job_sync(db: Session, job_data: JobCreate) -> JobModel:
+    def submit_job_sync(shards: ShardSessions, job_data: JobCreate, timer: PhaseTimer) -> JobModel:
+        if settings.fair_scheduling:
+            quota = settings.fair_queue_quotas.get(job_data.tenant, settings.fair_queue_default_quota)
+            if quota and tenant_backlog(redis_client, job_data.tenant) >= quota:
+                logger.warning("Tenant '%s' exceeded its quota of %s queued jobs.", job_data.tenant, quota)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"Tenant '{job_data.tenant}' already has {quota} jobs queued."
+                )
+
+        # The shard is encoded in the id, so later lookups go straight to it
+        shard = pick_shard(len(shards))
+        db = shards.for_shard(shard)
         new_job = JobModel(
+            id=new_job_id(shard=shard),
             job_type=job_data.job_type,
+            tenant=job_data.tenant,
             payload=job_data.payload,
             status=JobStatus.QUEUED.value
         )
-        db.add(new_job)
-        db.commit()
-        db.refresh(new_job)
+        with timer.phase("db"):
+            db.add(new_job)
+            db.commit()
+            db.refresh(new_job)
 
         try:
-            celery_app.send_task(
-                "src.worker.celery_worker.process_job",
-                args=[new_job.id],
-                queue="job_queue"
-            )
-            logger.info(f"API received job {new_job.id} queued for processing (type: {new_job.job_type})")
+            with timer.phase("publish"):
+                if settings.fair_scheduling:
+                    # The fair dispatcher moves it from the tenant's sub-queue to Celery
+                    enqueue_job(redis_client, job_data.tenant, int(new_job.id))
+                else:
+                    get_celery_app().send_task(
+                        "src.worker.celery_worker.process_job",
+                        args=[new_job.id],
+                        queue="job_queue"
+                    )
+            logger.info("API received job %s queued for processing (type: %s)", new_job.id, new_job.job_type)
         except Exception as e:
-            logger.error(f"Failed to queue job {new_job.id} to Celery: {e}")
+            logger.error("Failed to queue job %s to Celery: %s", new_job.id, e)
             new_job.status = JobStatus.FAILED.value  # type: ignore
             new_job.error_message = {"error": "Celery Connection Error", "details": str(e)}  # type: ignore
             db.commit()
@@ -65,14 +109,17 @@ async def submit_job(
             )
         return new_job
 
-    new_job: JobModel = await run_in_threadpool(submit_job_sync, db, job_data)
+    new_job: JobModel = await run_in_threadpool(submit_job_sync, shards, job_data, timer)
 
-    return JobSubmitResponse(
-        message="Job received successfully",
-        job_id=int(new_job.id),
-        job_type=str(new_job.job_type),
-        status=JobStatus(new_job.status)
-    )
+    with timer.phase("serialization"):
+        response = JobSubmitResponse(
+            message="Job received successfully",
+            job_id=int(new_job.id),
+            job_type=str(new_job.job_type),
+            status=JobStatus(new_job.status)
+        )
+    api_timings.record("submit_job", timer.phases)
+    return response
 
 
 @router.get(
@@ -82,58 +129,92 @@ async def submit_job(
 )
 async def get_job_status(
     job_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    shards: ShardSessions = Depends(get_shard_sessions)
 ) -> JobStatusResponse:
-    def get_job_sync(db: Session, job_id: int) -> Optional[JobModel]:
-        return db.query(JobModel).filter(JobModel.id == job_id).first()
+    timer = request_timer(request)
+
+    def get_job_sync(shards: ShardSessions, job_id: int) -> Optional[JobModel]:
+        try:
+            db = shards.for_job(job_id)
+        except LookupError:
+            return None
+        with timer.phase("db"):
+            return db.query(JobModel).filter(JobModel.id == job_id).first()
 
-    job: Optional[JobModel] = await run_in_threadpool(get_job_sync, db, job_id)
+    job: Optional[JobModel] = await run_in_threadpool(get_job_sync, shards, job_id)
 
     if not job:
-        logger.warning(f"Job with ID {job_id} not found.")
+        logger.warning("Job with ID %s not found.", job_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job with ID {job_id} not found."
         )
 
-    logger.info(f"Fetched status for job {job_id}: {job.status}")
-
-    return JobStatusResponse(
-        job_id=int(job.id),
-        job_type=str(job.job_type),
-        status=JobStatus(job.status),
-        retries=int(job.retries or 0),
-        created_at=job.created_at if isinstance(job.created_at, datetime) else datetime.utcnow(),
-        updated_at=job.updated_at if isinstance(job.updated_at, datetime) else datetime.utcnow(),
-        result=dict(job.result) if job.result else None,
-        error_message=job.error_message if isinstance(job.error_message, (str, dict)) else None
-    )
-
-
-@router.get(
-    "/",
-    response_model=List[JobStatusResponse],
-    summary="Get a list of the 50 most recent jobs"
-)
-async def get_all_jobs(
-    db: Session = Depends(get_db)
-) -> List[JobStatusResponse]:
-    def get_all_jobs_sync(db: Session) -> List[JobModel]:
-        return db.query(JobModel).order_by(JobModel.id.desc()).limit(50).all()
-
-    jobs: List[JobModel] = await run_in_threadpool(get_all_jobs_sync, db)
-    logger.info(f"Fetched {len(jobs)} recent jobs for dashboard.")
+    logger.info("Fetched status for job %s: %s", job_id, job.status)
 
-    return [
-        JobStatusResponse(
+    with timer.phase("serialization"):
+        response = JobStatusResponse(
             job_id=int(job.id),
             job_type=str(job.job_type),
+            tenant=str(job.tenant or "default"),
             status=JobStatus(job.status),
             retries=int(job.retries or 0),
             created_at=job.created_at if isinstance(job.created_at, datetime) else datetime.utcnow(),
             updated_at=job.updated_at if isinstance(job.updated_at, datetime) else datetime.utcnow(),
             result=dict(job.result) if job.result else None,
-            error_message=job.error_message if isinstance(job.error_message, (str, dict)) else None
+            error_message=job.error_message if isinstance(job.error_message, (str, dict)) else None,
+            timings=job.timings if isinstance(job.timings, dict) else None
         )
-        for job in jobs
-    ]
\ No newline at end of file
+    api_timings.record("get_job_status", timer.phases)
+    return response
+
+
+@router.get(
+    "/",
+    response_model=List[JobStatusResponse],
+    summary="Get a list of the 50 most recent jobs"
+)
+async def get_all_jobs(
+    request: Request,
+    shards: ShardSessions = Depends(get_shard_sessions)
+) -> List[JobStatusResponse]:
+    timer = request_timer(request)
+    sharded = len(shards) > 1
+
+    def get_recent_jobs_sync(shard: int) -> List[JobModel]:
+        db = shards.for_shard(shard)
+        # With several shards, "db" is the whole scatter-gather and the per-shard
+        # phases show which shard a slow listing waited on
+        with timer.phase(f"db.shard{shard}" if sharded else "db"):
+            return db.query(JobModel).order_by(JobModel.id.desc()).limit(50).all()
+
+    # Scatter-gather: each shard returns its 50 newest jobs in parallel, and since
+    # ids are time-ordered the overall 50 newest come from merging those lists
+    with timer.phase("db") if sharded else nullcontext():
+        per_shard: List[List[JobModel]] = await asyncio.gather(*(
+            run_in_threadpool(get_recent_jobs_sync, shard) for shard in range(len(shards))
+        ))
+        jobs: List[JobModel] = list(itertools.islice(
+            heapq.merge(*per_shard, key=lambda job: int(job.id), reverse=True), 50
+        ))
+    logger.info("Fetched %s recent jobs for dashboard.", len(jobs))
+
+    with timer.phase("serialization"):
+        response = [
+            JobStatusResponse(
+                job_id=int(job.id),
+                job_type=str(job.job_type),
+                tenant=str(job.tenant or "default"),
+                status=JobStatus(job.status),
+                retries=int(job.retries or 0),
+                created_at=job.created_at if isinstance(job.created_at, datetime) else datetime.utcnow(),
+                updated_at=job.updated_at if isinstance(job.updated_at, datetime) else datetime.utcnow(),
+                result=dict(job.result) if job.result else None,
+                error_message=job.error_message if isinstance(job.error_message, (str, dict)) else None,
+                timings=job.timings if isinstance(job.timings, dict) else None
+            )
+            for job in jobs
+        ]
+    api_timings.record("get_all_jobs", timer.phases)
+    return response
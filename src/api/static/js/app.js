@@ -35,13 +35,13 @@ function renderJobs(jobs) {
         `;
         return;
     }
-    jobs.sort((a, b) => b.id - a.id);
+    // The API returns jobs newest first
     jobs.forEach(job => {
         const row = document.createElement('tr');
         row.className = 'hover:bg-indigo-50 transition duration-100';
         const createdDate = new Date(job.created_at).toLocaleString();
         row.innerHTML = `
-            <td class="px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900">${job.id}</td>
+            <td class="px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900">${job.job_id}</td>
             <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">${job.job_type}</td>
             <td class="px-6 py-4 whitespace-nowrap text-sm">${getStatusBadge(job.status)}</td>
             <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">${createdDate}</td>
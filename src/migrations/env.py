@@ -0,0 +1,51 @@
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from src.api.core.database import Base
+# Import models so their tables are registered on Base.metadata for autogenerate
+from src.api.models.sql_models import job  # noqa: F401
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """
+    Emits SQL to stdout instead of executing it (alembic --sql).
+    """
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """
+    Runs migrations against a live connection. Migrations use a dedicated
+    NullPool engine rather than the application's pooled engine.
+    """
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # batch mode lets ALTER-style migrations work on SQLite as well
+            render_as_batch=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
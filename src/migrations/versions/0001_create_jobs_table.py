@@ -0,0 +1,51 @@
+"""create jobs table
+
+Databases created by the old create_all() startup hook already have this
+table; mark them as migrated once with:
+
+    python -m src.api.core.migrations stamp 0001
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Mirrors JSONType in the models: JSONB on PostgreSQL, JSON elsewhere
+json_type = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("job_type", sa.String(), nullable=False),
+        sa.Column("payload", json_type, nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("queued", "processing", "completed", "failed", "retrying", name="job_status", native_enum=False),
+            nullable=False,
+        ),
+        sa.Column("retries", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("result", json_type, nullable=True),
+        sa.Column("error_message", json_type, nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_jobs_id"), "jobs", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_jobs_id"), table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,28 @@
+"""add tenant to jobs
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.add_column(sa.Column("tenant", sa.String(), server_default="default", nullable=False))
+        batch_op.create_index(batch_op.f("ix_jobs_tenant"), ["tenant"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_index(batch_op.f("ix_jobs_tenant"))
+        batch_op.drop_column("tenant")
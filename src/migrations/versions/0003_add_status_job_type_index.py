@@ -0,0 +1,32 @@
+"""add status/job_type index for admission control sampling
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build concurrently on PostgreSQL so submits are not blocked on a large table
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_status_job_type",
+            "jobs",
+            ["status", "job_type"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_jobs_status_job_type", table_name="jobs", postgresql_concurrently=True)
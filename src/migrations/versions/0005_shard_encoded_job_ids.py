@@ -0,0 +1,50 @@
+"""widen job ids for shard-encoded snowflake ids
+
+On PostgreSQL, changing the column type rewrites the whole jobs table (and its
+indexes) under an ACCESS EXCLUSIVE lock: submits, status reads and worker
+updates block until it finishes. Run it in a maintenance window with the API
+and workers stopped; on a large table, time a run against a copy first.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.alter_column(
+            "id",
+            existing_type=sa.Integer(),
+            type_=sa.BigInteger(),
+            existing_nullable=False,
+        )
+    if op.get_context().dialect.name == "postgresql":
+        # Ids are generated by the API now (src/api/core/ids.py); a serial id
+        # inserted on any shard but the first would route to the wrong one.
+        # Existing ids all fit in 32 bits, below any generated id, and keep
+        # routing to shard 0.
+        op.execute("ALTER TABLE jobs ALTER COLUMN id DROP DEFAULT")
+
+
+def downgrade() -> None:
+    # Only possible while every id still fits in 32 bits
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("ALTER TABLE jobs ALTER COLUMN id SET DEFAULT nextval('jobs_id_seq'::regclass)")
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.alter_column(
+            "id",
+            existing_type=sa.BigInteger(),
+            type_=sa.Integer(),
+            existing_nullable=False,
+        )
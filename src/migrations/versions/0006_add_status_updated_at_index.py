@@ -0,0 +1,32 @@
+"""add status/updated_at index for the admission-control drain rate
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build concurrently on PostgreSQL so submits are not blocked on a large table
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_status_updated_at",
+            "jobs",
+            ["status", "updated_at"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_jobs_status_updated_at", table_name="jobs", postgresql_concurrently=True)
@@ -1,23 +1,67 @@
-import os
 import time
 import random
+from datetime import datetime
 from typing import Any, Dict, Optional, Tuple
 from celery import Task
+from celery.worker.control import control_command
+from celery.signals import setup_logging as setup_logging_signal, worker_process_init
 
-from ..api.core.celery_app import celery_app
-from ..api.core.database import SessionLocal
-from ..api.core.logging_config import setup_logging, get_logger
-from ..api.models.sql_models.job import Job as JobModel
-from .db_utils import get_db_session
+from ..api.core.celery_app import get_celery_app
+from ..api.core.logging_config import setup_logging_from_env, get_logger
+from ..api.core.profiling import PhaseTimer, job_timings, sampler
+from .db_utils import claim_job, update_job
 
-# Setup logging for worker process
-setup_logging(
-    level=os.getenv("LOG_LEVEL", "INFO"),
-    json_logs=os.getenv("JSON_LOGS", "false").lower() == "true"
-)
+celery_app = get_celery_app()
 logger = get_logger(__name__)
 
 
+@setup_logging_signal.connect
+def configure_worker_logging(**kwargs: Any) -> None:
+    """
+    Configures logging once the worker process boots, instead of at import time.
+    Connecting to this signal also stops Celery from installing its own handlers.
+    """
+    setup_logging_from_env()
+
+
+@worker_process_init.connect
+def configure_child_logging(**kwargs: Any) -> None:
+    """
+    Re-configures logging in forked pool processes: the async log listener
+    thread of the parent does not survive the fork.
+    """
+    setup_logging_from_env()
+
+
+@control_command(
+    args=[("seconds", float), ("job_type", str)],
+    signature="[seconds [job_type]]",
+)
+def profile_start(state: Any, seconds: float = 10.0, job_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Remote control: starts sampling this worker's stacks for `seconds`,
+    optionally only while jobs of `job_type` run. Fetch it with `profile_dump`.
+    """
+    started = sampler.start(seconds, label=job_type or None)
+    return {"ok": "profiling started" if started else "a profile is already running"}
+
+
+@control_command()
+def profile_dump(state: Any) -> Dict[str, Any]:
+    """
+    Remote control: returns the last finished profile as collapsed stacks.
+    """
+    return {"running": sampler.running, "profile": sampler.last_profile}
+
+
+@control_command()
+def job_timings_stats(state: Any) -> Dict[str, Any]:
+    """
+    Remote control: returns this worker's aggregated phase timings per job_type.
+    """
+    return job_timings.snapshot()
+
+
 def update_job_status_on_failure(
         task: Task,
         exc: BaseException, 
@@ -31,94 +75,114 @@ def update_job_status_on_failure(
     Updates the job status in the database to 'failed'.
     """
     job_id: Optional[int] = args[0] if args else None
-    logger.error(f"Job {job_id} permanently failed after retries.", exc_info=True)
+    logger.error("Job %s permanently failed after retries.", job_id, exc_info=True)
 
     if job_id is None:
         logger.error("No job_id passed to failure handler.")
         return
 
-    with get_db_session() as db:
-        try:
-            job = db.query(JobModel).filter(JobModel.id == job_id).first()
-            if job:
-                job.status = "failed"
-                job.result = None
-                job.error_message = {
-                    "error": str(exc),
-                    "details": "Job failed after all retries were exhausted."
-                }
-                logger.info(f"Database status for job {job_id} updated to 'failed'.")
-        except Exception as update_e:
-            logger.error(
-                f"FATAL: Could not update status for failed job {job_id}: {update_e}",
-                exc_info=True
-            )
-
-
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3})
+    try:
+        if update_job(
+            job_id,
+            status="failed",
+            result=None,
+            error_message={
+                "error": str(exc),
+                "details": "Job failed after all retries were exhausted."
+            },
+        ):
+            logger.info("Database status for job %s updated to 'failed'.", job_id)
+    except Exception as update_e:
+        logger.error(
+            "FATAL: Could not update status for failed job %s: %s", job_id, update_e,
+            exc_info=True
+        )
+
+
+def run_job_handler(task: Task, job_id: int, raw_job_type: str) -> Dict[str, Any]:
+    """
+    Runs the (simulated) handler for a job type and returns its result.
+    Called outside any database transaction so no connection is held while it runs.
+    """
+    jt: str = raw_job_type.strip().lower()
+
+    if "email" in jt or "send" in jt:
+        logger.info("Job %s: Simulating quick email send ...", job_id)
+        time.sleep(2)
+        return {"status": "success", "message": "Email sent successfully."}
+
+    if "long" in jt or "calculation" in jt or "compute" in jt:
+        logger.info("Job %s: Starting long-running calculation ...", job_id)
+        time.sleep(10)
+        return {"status": "success", "message": "Calculation completed successfully."}
+
+    if "data" in jt or "analysis" in jt:
+        if task.request.retries < 2 and random.random() < 0.7:
+            logger.warning("Job %s: Simulated transient failure for data analysis.", job_id)
+            raise RuntimeError("External service connection timed out (simulated transient error).")
+        time.sleep(3)
+        return {"status": "success", "data": "Analysis complete. Report available."}
+
+    logger.warning("Job %s: Unknown job type '%s'. Running default handler.", job_id, raw_job_type)
+    time.sleep(1)
+    return {"status": "success", "message": "Default handler executed."}
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_kwargs={'max_retries': 3},
+    on_failure=update_job_status_on_failure,
+)
 def process_job(
     self: Task,
     job_id: int) -> None:
     """
     Processes a job (simulated). Supports retries and updates job status accordingly.
+    The jobs table is the only place job state and results are written: the task
+    returns nothing and its Celery result is ignored.
     """
     is_retry = self.request.retries > 0
     attempt = self.request.retries + 1
-    logger.info(f"Processing job with ID: {job_id}, Attempt: {attempt}")
+    logger.info("Processing job with ID: %s, Attempt: %s", job_id, attempt)
 
+    timer = PhaseTimer()
+    job_type = "unknown"
     try:
-        with get_db_session() as db:
-            job = db.query(JobModel).filter(JobModel.id == job_id).first()
-            if not job:
-                raise ValueError(f"Job with ID {job_id} not found in database.")
-            
-            raw_job_type = (job.job_type or "").strip()
-            jt: str = raw_job_type.lower()
-
-            job.status = "processing" if not is_retry else "retrying"
-            logger.info(f"Job {job_id} status set to '{job.status}'.")
-
-            final_result: Optional[Dict[str, Any]] = None
-
-            # Main job logic simulation
-            if "email" in jt or "send" in jt:
-                logger.info(f"Job {job_id}: Simulating quick email send ...")
-                time.sleep(2)
-                final_result = {"status": "success", "message": "Email sent successfully."}
-            
-            elif "long" in jt or "calculation" in jt or "compute" in jt:
-                logger.info(f"Job {job_id}: Starting long-running calculation ...")
-                time.sleep(10)
-                final_result = {"status": "success", "message": "Calculation completed successfully."}
-
-            elif "data" in jt or "analysis" in jt:
-                if self.request.retries < 2 and random.random() < 0.7:
-                    logger.warning(f"Job {job_id}: Simulated transient failure for data analysis.")
-                    raise RuntimeError("External service connection timed out (simulated transient error).")
-                time.sleep(3)
-                final_result = {"status": "success", "data": "Analysis complete. Report available."}
-            
-            else:
-                logger.warning(f"Job {job_id}: Unknown job type '{raw_job_type}'. Running default handler.")
-                time.sleep(1)
-                final_result = {"status": "success", "message": "Default handler executed."}
-            
-            # Mark job completed
-            job.status = "completed"
-            job.result = final_result
-            job.error_message = None
-            logger.info(f"Finished processing job {job.id}. Status updated to 'completed'.")
+        # Claim: mark the job as picked up and read its type in one statement
+        claim_status = "processing" if not is_retry else "retrying"
+        with timer.phase("claim"):
+            claimed = claim_job(job_id, claim_status)
+        if claimed is None:
+            raise ValueError(f"Job with ID {job_id} not found in database.")
+        raw_job_type, created_at = claimed
+        if not is_retry and created_at is not None:
+            # Time from submission until a worker picked the job up
+            timer.add("queue_wait", max(0.0, (datetime.utcnow() - created_at).total_seconds() * 1000))
+        logger.info("Job %s status set to '%s'.", job_id, claim_status)
+
+        job_type = (raw_job_type or "").strip()
+        with timer.phase("handler"), sampler.label(job_type):
+            final_result = run_job_handler(self, job_id, raw_job_type or "")
+
+        # Persist: write the terminal state (and this attempt's timings) with a single UPDATE
+        with timer.phase("persist"):
+            update_job(job_id, status="completed", result=final_result, error_message=None, timings=timer.compact())
+        job_timings.record(job_type, timer.phases)
+        logger.info("Finished processing job %s. Status updated to 'completed'.", job_id)
 
     except Exception as e:
-        logger.exception(f"Error while processing job {job_id}: {e}")
+        logger.exception("Error while processing job %s: %s", job_id, e)
+        # Failed attempts keep their timings too, aggregated apart from successful ones
         if self.request.retries < self.max_retries:
-            with get_db_session() as db:
-                job = db.query(JobModel).filter(JobModel.id == job_id).first()
-                if job:
-                    job.status = "retrying"
-                    job.retries = self.request.retries + 1
-            logger.warning(f"Job {job_id} failed on attempt {attempt}. Retrying in 5 seconds ...")
+            with timer.phase("persist"):
+                update_job(job_id, status="retrying", retries=self.request.retries + 1, timings=timer.compact())
+            job_timings.record(f"{job_type}:failed", timer.phases)
+            logger.warning("Job %s failed on attempt %s. Retrying in 5 seconds ...", job_id, attempt)
             raise self.retry(exc=e, countdown=5)
         else:
-            logger.error(f"Job {job_id} failed on final attempt. Letting failure handler set final status.")
+            with timer.phase("persist"):
+                update_job(job_id, timings=timer.compact())
+            job_timings.record(f"{job_type}:failed", timer.phases)
+            logger.error("Job %s failed on final attempt. Letting failure handler set final status.", job_id)
             raise e
@@ -1,27 +1,76 @@
+import datetime
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator, Optional, Tuple, cast
+from sqlalchemy import update
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.orm import Session
-from src.api.core.database import SessionLocal
+from src.api.core.database import get_shard_session_factory, get_shard_urls
+from src.api.core.ids import shard_of
 from src.api.core.logging_config import get_logger
+from src.api.models.sql_models.job import Job as JobModel
 
 logger = get_logger(__name__)
 
 @contextmanager
-def get_db_session() -> Generator[Session, None, None]:
+def get_db_session(shard: int = 0) -> Generator[Session, None, None]:
     """ 
-    Provides a database session inside a context manager.
+    Provides a database session on the given shard inside a context manager.
     Ensures the session is committed if successful, rolled back on error,
     and always closed at the end.
     """
-    db = SessionLocal()
+    db = get_shard_session_factory(shard)()
     try:
         yield db
         db.commit()
         logger.debug("Database session committed successfully.")
     except Exception as e:
         db.rollback()
-        logger.exception(f"Error during DB session, rolled back: {e}")
+        logger.exception("Error during DB session, rolled back: %s", e)
         raise
     finally:
         db.close()
         logger.debug("Database session closed.")
+
+
+def job_shard(job_id: int) -> Optional[int]:
+    """
+    Returns the shard holding a job (decoded from its id), or None if the id
+    points at a shard this deployment does not have.
+    """
+    shard_count = len(get_shard_urls())
+    if shard_count == 1:
+        return 0
+    shard = shard_of(job_id)
+    return shard if shard < shard_count else None
+
+
+def claim_job(job_id: int, status: str) -> Optional[Tuple[str, datetime.datetime]]:
+    """
+    Marks a job as picked up and returns its (job_type, created_at) in a single
+    UPDATE ... RETURNING round trip on the job's shard. Returns None if the job
+    does not exist.
+    """
+    shard = job_shard(job_id)
+    if shard is None:
+        return None
+    with get_db_session(shard) as db:
+        row = db.execute(
+            update(JobModel)
+            .where(JobModel.id == job_id)
+            .values(status=status)
+            .returning(JobModel.job_type, JobModel.created_at)
+        ).one_or_none()
+        return (row.job_type, row.created_at) if row is not None else None
+
+
+def update_job(job_id: int, **values: Any) -> bool:
+    """
+    Writes the given columns for one job with a single UPDATE statement,
+    without loading the row first. Returns False if no job matched.
+    """
+    shard = job_shard(job_id)
+    if shard is None:
+        return False
+    with get_db_session(shard) as db:
+        result = cast(CursorResult, db.execute(update(JobModel).where(JobModel.id == job_id).values(**values)))
+        return bool(result.rowcount)
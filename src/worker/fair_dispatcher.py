@@ -0,0 +1,162 @@
+import time
+from typing import Any, Optional, Tuple
+
+import redis
+
+from ..api.core.celery_app import get_celery_app
+from ..api.core.fair_queue import (
+    INFLIGHT_PREFIX,
+    READY_TENANTS_KEY,
+    TENANT_QUEUE_PREFIX,
+    DeficitRoundRobin,
+    tenant_queue_key,
+)
+from ..api.core.logging_config import setup_logging_from_env, get_logger
+from ..api.core.settings import settings
+
+logger = get_logger(__name__)
+
+CELERY_QUEUE = "job_queue"
+# A failing broker or Redis fails every dispatch attempt; log at most this often
+ERROR_LOG_INTERVAL = 60.0
+
+
+class FairDispatcher:
+    """
+    Feeds the Celery `job_queue` from per-tenant Redis sub-queues using
+    deficit round robin, keeping at most `window` messages ahead of the workers
+    so a tenant with a huge backlog cannot fill the shared queue.
+
+    Each dispatch costs one scheduler step, one LMOVE, one publish and one
+    LREM, independent of how many tenants are active. The LMOVE parks the job
+    in this dispatcher's in-flight list until it is published, so a crash in
+    between cannot lose it (it may be published twice instead).
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        broker_client: Any,
+        scheduler: DeficitRoundRobin,
+        window: int,
+        dispatcher_id: str = "default",
+    ) -> None:
+        self.redis = redis_client
+        self.broker = broker_client
+        self.scheduler = scheduler
+        self.window = window
+        self.inflight_key = f"{INFLIGHT_PREFIX}{dispatcher_id}"
+        self.celery_app = get_celery_app()
+
+    @staticmethod
+    def _decode(value: Any) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _publish(self, job_id: int) -> None:
+        self.celery_app.send_task(
+            "src.worker.celery_worker.process_job",
+            args=[job_id],
+            queue=CELERY_QUEUE
+        )
+
+    def recover(self) -> None:
+        """
+        Publishes jobs left in flight by a previous run of this dispatcher and
+        re-activates every tenant with a backlog, e.g. after a restart.
+        Scans the keyspace once, so it is only used at startup.
+        """
+        leftovers = self.redis.lrange(self.inflight_key, 0, -1)
+        for job_id in leftovers:
+            # They were already selected by the scheduler; publish them as it would have
+            self._publish(int(job_id))
+            self.redis.lrem(self.inflight_key, 1, job_id)
+        if leftovers:
+            logger.warning("Published %s jobs left in flight by a previous run.", len(leftovers))
+
+        for key in self.redis.scan_iter(match=f"{TENANT_QUEUE_PREFIX}*"):
+            self.scheduler.activate(self._decode(key)[len(TENANT_QUEUE_PREFIX):])
+        logger.info("Recovered %s tenants with queued jobs.", len(self.scheduler))
+
+    def _activate_ready_tenants(self) -> None:
+        """
+        Moves tenants announced by the API (sub-queue went from empty to non-empty)
+        into the scheduler's ring.
+        """
+        while True:
+            tenant = self.redis.lpop(READY_TENANTS_KEY)
+            if tenant is None:
+                return
+            self.scheduler.activate(self._decode(tenant))
+
+    def _next_job(self) -> Optional[Tuple[str, int]]:
+        while True:
+            tenant = self.scheduler.select()
+            if tenant is None:
+                return None
+            job_id = self.redis.lmove(tenant_queue_key(tenant), self.inflight_key, "LEFT", "RIGHT")
+            if job_id is not None:
+                return tenant, int(job_id)
+            self.scheduler.remove(tenant)
+
+    def dispatch_once(self) -> int:
+        """
+        Tops `job_queue` up to the window and returns how many jobs were sent.
+        """
+        self._activate_ready_tenants()
+        free = self.window - int(self.broker.llen(CELERY_QUEUE))
+        sent = 0
+        while sent < free:
+            next_job = self._next_job()
+            if next_job is None:
+                break
+            tenant, job_id = next_job
+            try:
+                self._publish(job_id)
+            except Exception:
+                # Move it back to the front of its sub-queue; the tenant stays active
+                logger.exception("Failed to publish job %s; will retry.", job_id)
+                self.redis.lmove(self.inflight_key, tenant_queue_key(tenant), "RIGHT", "LEFT")
+                raise
+            self.redis.lrem(self.inflight_key, 1, job_id)
+            sent += 1
+        return sent
+
+    def run_forever(self, poll_interval: float = 0.05) -> None:
+        logger.info("Fair dispatcher started (window=%s).", self.window)
+        self.recover()
+        last_logged = float("-inf")
+        suppressed = 0
+        while True:
+            try:
+                sent = self.dispatch_once()
+            except Exception:
+                now = time.monotonic()
+                if now - last_logged >= ERROR_LOG_INTERVAL:
+                    logger.exception("Fair dispatch failed; retrying (%s more failures since the last report).",
+                                     suppressed)
+                    last_logged, suppressed = now, 0
+                else:
+                    suppressed += 1
+                time.sleep(1)
+                continue
+            if sent == 0:
+                time.sleep(poll_interval)
+
+
+def main() -> None:
+    """
+    Entry point: python -m src.worker.fair_dispatcher
+    """
+    setup_logging_from_env()
+    dispatcher = FairDispatcher(
+        redis_client=redis.from_url(settings.redis_url),
+        broker_client=redis.from_url(settings.celery_broker_url),
+        scheduler=DeficitRoundRobin(settings.fair_queue_weights, settings.fair_queue_default_weight),
+        window=settings.fair_dispatch_window,
+        dispatcher_id=settings.fair_dispatcher_id,
+    )
+    dispatcher.run_forever()
+
+
+if __name__ == "__main__":
+    main()
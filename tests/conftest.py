@@ -13,10 +13,13 @@ os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 os.environ["CELERY_BROKER_URL"] = "memory://"
 os.environ["CELERY_RESULT_BACKEND"] = "cache+memory://"
 
+# Fixed node id for generated job ids, instead of allocating one from Redis.
+os.environ["NODE_ID"] = "0"
+
 
 # Import application AFTER environment variables are set.
 from src.api.main import app
-from src.api.core.database import Base, get_db
+from src.api.core.database import Base, ShardSessions, get_shard_sessions
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
@@ -57,13 +60,11 @@ def client(db_session: Session) -> TestClient:
     """
     Provide a TestClient that uses our db_session via dependency override.
     """
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    def override_get_shard_sessions():
+        # A single shard backed by the test session
+        yield ShardSessions([lambda: db_session])
 
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_shard_sessions] = override_get_shard_sessions
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
\ No newline at end of file
@@ -0,0 +1,108 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.core.admission import AdmissionController, Rejection
+from src.api.core.settings import settings
+
+
+def make_controller(depth, finished, **kwargs) -> AdmissionController:
+    controller = AdmissionController(sampler=lambda: (depth, finished), rate_window=60.0, **kwargs)
+    controller.refresh()
+    return controller
+
+
+def test_admits_when_under_limits():
+    controller = make_controller({"email": 10}, {"email": 60}, max_queue_depth=100)
+    controller.admit("email")
+    assert controller.drain_seconds() == pytest.approx(11.0)
+
+
+def test_rejects_full_queue_with_retry_after_from_drain_rate():
+    """
+    Tests that Retry-After is the time to drain back under the depth limit.
+    """
+    # 120 waiting, limit 100, 120 finished/min -> 2 jobs/s -> 21 excess jobs ~ 11s
+    controller = make_controller({"email": 120}, {"email": 120}, max_queue_depth=100)
+    with pytest.raises(Rejection) as excinfo:
+        controller.admit("email")
+    assert excinfo.value.retry_after == 11
+
+
+def test_rejects_when_drain_time_too_long():
+    controller = make_controller({"report": 1000}, {"report": 60}, max_drain_seconds=600)
+    with pytest.raises(Rejection) as excinfo:
+        controller.admit("report")
+    assert excinfo.value.retry_after == 300  # clamped to max_retry_after
+
+
+def test_job_type_limit_only_affects_that_type():
+    controller = make_controller({"report": 5}, {"report": 60}, job_type_limits={"report": 5})
+    with pytest.raises(Rejection):
+        controller.admit("report")
+    controller.admit("email")
+
+
+def test_sheds_low_priority_types_first():
+    """
+    Tests that shed types are rejected once drain time passes the shed threshold,
+    while other types are still admitted.
+    """
+    controller = make_controller(
+        {"email": 300}, {"email": 120},
+        shed_job_types=["analytics"], shed_drain_seconds=60, max_drain_seconds=600,
+    )
+    with pytest.raises(Rejection) as excinfo:
+        controller.admit("analytics")
+    assert excinfo.value.retry_after == 90
+    controller.admit("email")
+
+
+def test_soak_queue_growth_is_bounded_under_overload():
+    """
+    Simulates 30 minutes of clients submitting at twice the drain rate (and
+    retrying after Retry-After) and checks that the queue stays bounded.
+    """
+    max_depth = 500
+    drain_per_second = 10
+    arrivals_per_second = 20
+    queue = {"email": 0}
+    finished_log = []  # completion timestamps, for the rate window
+    clock = [0.0]
+
+    def sampler():
+        recent = sum(1 for t in finished_log if t > clock[0] - 60)
+        return dict(queue), {"email": recent}
+
+    controller = AdmissionController(sampler=sampler, max_queue_depth=max_depth, max_drain_seconds=30)
+    peak = 0
+    rejected = 0
+    for second in range(1800):
+        clock[0] = float(second)
+        if second % 2 == 0:
+            controller.refresh()
+        for _ in range(arrivals_per_second):
+            try:
+                controller.admit("email")
+                queue["email"] += 1
+            except Rejection as rejection:
+                assert 1 <= rejection.retry_after <= 300
+                rejected += 1
+        done = min(drain_per_second, queue["email"])
+        queue["email"] -= done
+        finished_log.extend([clock[0]] * done)
+        peak = max(peak, queue["email"])
+
+    assert rejected > 0
+    # Bounded by the drain-time limit (30s at 10 jobs/s) plus one sampling interval of arrivals
+    assert peak <= 30 * drain_per_second + 2 * arrivals_per_second
+
+
+def test_submit_returns_429_with_retry_after(client: TestClient):
+    controller = make_controller({"email": 120}, {"email": 120}, max_queue_depth=100)
+    with patch.object(settings, "admission_control", True), \
+            patch("src.api.routers.jobs.get_admission_controller", return_value=controller):
+        response = client.post("/jobs/submit", json={"job_type": "email"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "11"
@@ -0,0 +1,275 @@
+import fnmatch
+from collections import Counter
+from typing import Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.core.fair_queue import READY_TENANTS_KEY, DeficitRoundRobin, enqueue_job, tenant_queue_key
+from src.api.core.settings import settings
+from src.worker.fair_dispatcher import CELERY_QUEUE, FairDispatcher
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the Redis list commands used by the fair queue.
+    Values are stored as bytes, like redis-py returns them.
+    """
+
+    def __init__(self) -> None:
+        self.lists: Dict[str, List[bytes]] = {}
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def _list(self, key: str) -> List[bytes]:
+        return self.lists.setdefault(key, [])
+
+    def _prune(self, key: str) -> None:
+        if not self.lists.get(key):
+            self.lists.pop(key, None)
+
+    def rpush(self, key: str, value) -> int:
+        self._list(key).append(self._encode(value))
+        return len(self.lists[key])
+
+    def lpush(self, key: str, value) -> int:
+        self._list(key).insert(0, self._encode(value))
+        return len(self.lists[key])
+
+    def lpop(self, key: str):
+        value = self._list(key).pop(0) if self.lists.get(key) else None
+        self._prune(key)
+        return value
+
+    def llen(self, key: str) -> int:
+        return len(self.lists.get(key, []))
+
+    def lrange(self, key: str, start: int, end: int) -> List[bytes]:
+        values = self.lists.get(key, [])
+        return values[start:] if end == -1 else values[start:end + 1]
+
+    def lrem(self, key: str, count: int, value) -> int:
+        values = self.lists.get(key, [])
+        encoded = self._encode(value)
+        if encoded not in values:
+            return 0
+        values.remove(encoded)
+        self._prune(key)
+        return 1
+
+    def lmove(self, source: str, destination: str, src: str, dest: str):
+        if not self.lists.get(source):
+            return None
+        value = self.lists[source].pop(0 if src == "LEFT" else -1)
+        self._prune(source)
+        if dest == "LEFT":
+            self._list(destination).insert(0, value)
+        else:
+            self._list(destination).append(value)
+        return value
+
+    def scan_iter(self, match: str):
+        return [key.encode() for key in list(self.lists) if fnmatch.fnmatchcase(key, match)]
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
+
+
+def make_dispatcher(fake_redis: FakeRedis, window: int = 100, weights=None, fail: bool = False) -> FairDispatcher:
+    """
+    Builds a dispatcher whose Celery publishes land in the fake broker's job_queue.
+    """
+    celery_app = MagicMock()
+
+    def send_task(name, args, queue):
+        if fail:
+            raise ConnectionError("broker down")
+        fake_redis.rpush(queue, args[0])
+
+    celery_app.send_task.side_effect = send_task
+    with patch("src.worker.fair_dispatcher.get_celery_app", return_value=celery_app):
+        return FairDispatcher(fake_redis, fake_redis, DeficitRoundRobin(weights), window)
+
+
+def published(fake_redis: FakeRedis) -> List[int]:
+    return [int(job_id) for job_id in fake_redis.lists.get(CELERY_QUEUE, [])]
+
+
+def test_drr_shares_dispatches_by_weight():
+    """
+    Tests that backlogged tenants are served in proportion to their weights.
+    """
+    drr = DeficitRoundRobin({"big": 3})
+    for tenant in ("big", "small"):
+        drr.activate(tenant)
+
+    served = Counter(drr.select() for _ in range(400))
+    assert served == {"big": 300, "small": 100}
+
+
+def test_drr_small_tenant_is_not_starved_by_backlog():
+    """
+    Tests that a tenant arriving behind a huge backlog is served within one round.
+    """
+    drr = DeficitRoundRobin()
+    drr.activate("noisy")
+    for _ in range(1000):
+        assert drr.select() == "noisy"
+
+    drr.activate("quiet")
+    assert "quiet" in [drr.select() for _ in range(2)]
+
+
+def test_drr_remove_and_reactivate():
+    """
+    Tests that emptied tenants leave the ring and can rejoin later.
+    """
+    drr = DeficitRoundRobin({"a": 2})
+    drr.activate("a")
+    drr.activate("b")
+    assert drr.select() == "a"
+    drr.remove("a")
+    assert len(drr) == 1
+    assert drr.select() == "b"
+    drr.remove("b")
+    assert drr.select() is None
+
+    drr.activate("a")
+    assert drr.select() == "a"
+
+
+def test_drr_rejects_non_positive_weights():
+    with pytest.raises(ValueError):
+        DeficitRoundRobin({"a": 0})
+
+
+def test_submit_job_uses_tenant_sub_queue(client: TestClient):
+    """
+    Tests that with fair scheduling enabled the job goes to its tenant's
+    sub-queue instead of straight to Celery, and that the tenant is stored.
+    """
+    with patch.object(settings, "fair_scheduling", True), \
+            patch("src.api.routers.jobs.tenant_backlog", return_value=0), \
+            patch("src.api.routers.jobs.enqueue_job") as mock_enqueue, \
+            patch("src.worker.celery_worker.celery_app.send_task") as mock_send:
+        response = client.post("/jobs/submit", json={"job_type": "send_email", "tenant": "acme"})
+        assert response.status_code == 201
+        job_id = response.json()["job_id"]
+        mock_enqueue.assert_called_once()
+        assert mock_enqueue.call_args.args[1:] == ("acme", job_id)
+        mock_send.assert_not_called()
+
+    assert client.get(f"/jobs/status/{job_id}").json()["tenant"] == "acme"
+
+
+def test_submit_job_rejects_tenant_over_quota(client: TestClient):
+    """
+    Tests that a tenant whose sub-queue is at its quota gets a 429.
+    """
+    with patch.object(settings, "fair_scheduling", True), \
+            patch.object(settings, "fair_queue_quotas", {"acme": 10}), \
+            patch("src.api.routers.jobs.tenant_backlog", return_value=10), \
+            patch("src.api.routers.jobs.enqueue_job") as mock_enqueue:
+        response = client.post("/jobs/submit", json={"job_type": "send_email", "tenant": "acme"})
+        assert response.status_code == 429
+        mock_enqueue.assert_not_called()
+
+
+def test_enqueue_announces_tenant_only_when_its_queue_was_empty(fake_redis: FakeRedis):
+    assert enqueue_job(fake_redis, "acme", 1) == 1
+    assert enqueue_job(fake_redis, "acme", 2) == 2
+    assert fake_redis.lists[READY_TENANTS_KEY] == [b"acme"]
+
+
+def test_dispatcher_interleaves_tenants_and_respects_window(fake_redis: FakeRedis):
+    """
+    Tests that announced tenants are dispatched round robin and that the
+    shared queue is only topped up to the window.
+    """
+    for job_id in range(1, 11):
+        enqueue_job(fake_redis, "noisy", job_id)
+    enqueue_job(fake_redis, "quiet", 100)
+    dispatcher = make_dispatcher(fake_redis, window=4)
+
+    assert dispatcher.dispatch_once() == 4
+    assert published(fake_redis) == [1, 100, 2, 3]
+    assert dispatcher.dispatch_once() == 0
+
+    fake_redis.lists[CELERY_QUEUE] = fake_redis.lists[CELERY_QUEUE][3:]  # workers took three
+    assert dispatcher.dispatch_once() == 3
+    assert published(fake_redis) == [3, 4, 5, 6]
+    assert fake_redis.llen(dispatcher.inflight_key) == 0
+
+
+def test_emptied_tenant_is_reannounced_and_dispatched(fake_redis: FakeRedis):
+    """
+    Tests the ready-list handshake: a tenant whose queue ran dry leaves the
+    ring, and its next job announces it again.
+    """
+    dispatcher = make_dispatcher(fake_redis)
+    enqueue_job(fake_redis, "acme", 1)
+    assert dispatcher.dispatch_once() == 1
+    assert dispatcher.dispatch_once() == 0
+    assert len(dispatcher.scheduler) == 0
+
+    enqueue_job(fake_redis, "acme", 2)
+    assert dispatcher.dispatch_once() == 1
+    assert published(fake_redis) == [1, 2]
+
+
+def test_failed_publish_returns_job_to_front_of_its_queue(fake_redis: FakeRedis):
+    enqueue_job(fake_redis, "acme", 1)
+    enqueue_job(fake_redis, "acme", 2)
+    dispatcher = make_dispatcher(fake_redis, fail=True)
+
+    with pytest.raises(ConnectionError):
+        dispatcher.dispatch_once()
+    assert fake_redis.lists[tenant_queue_key("acme")] == [b"1", b"2"]
+    assert fake_redis.llen(dispatcher.inflight_key) == 0
+
+
+def test_recover_publishes_jobs_left_in_flight_and_reactivates_tenants(fake_redis: FakeRedis):
+    """
+    Tests that a job taken from its sub-queue by a dispatcher that died before
+    publishing it is published by the next run, and backlogged tenants resume.
+    """
+    enqueue_job(fake_redis, "acme", 1)
+    enqueue_job(fake_redis, "acme", 2)
+    crashed = make_dispatcher(fake_redis)
+    crashed._activate_ready_tenants()
+    assert crashed._next_job() == ("acme", 1)  # taken, then the process dies
+
+    dispatcher = make_dispatcher(fake_redis)
+    dispatcher.recover()
+    assert published(fake_redis) == [1]
+    assert fake_redis.llen(dispatcher.inflight_key) == 0
+
+    assert dispatcher.dispatch_once() == 1
+    assert published(fake_redis) == [1, 2]
+
+
+def test_run_forever_logs_dispatch_errors_at_most_once_per_interval(fake_redis: FakeRedis):
+    """
+    Tests that a persistently failing dispatch is logged with its traceback,
+    but not once per retry.
+    """
+    dispatcher = make_dispatcher(fake_redis)
+    sleeps = iter(range(3))
+
+    def sleep(seconds):
+        if next(sleeps, None) is None:
+            raise KeyboardInterrupt
+
+    with patch.object(dispatcher, "dispatch_once", side_effect=ConnectionError("broker down")), \
+            patch("src.worker.fair_dispatcher.time.monotonic", side_effect=[0.0, 1.0, 2.0, 61.0]), \
+            patch("src.worker.fair_dispatcher.time.sleep", side_effect=sleep), \
+            patch("src.worker.fair_dispatcher.logger") as mock_logger:
+        with pytest.raises(KeyboardInterrupt):
+            dispatcher.run_forever()
+
+    assert [c.args[1] for c in mock_logger.exception.call_args_list] == [0, 2]
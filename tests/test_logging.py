@@ -0,0 +1,80 @@
+import json
+import logging
+
+import pytest
+
+from src.api.core import logging_config
+from src.api.core.logging_config import OrjsonFormatter, SamplingFilter, setup_logging
+
+
+@pytest.fixture
+def restore_logging():
+    """
+    Restores the root logger after a test reconfigures it.
+    """
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    logging_config._stop_listener()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    logging.getLogger("tests.sampled").filters.clear()
+
+
+def _record(msg: str, level: int = logging.INFO, *args) -> logging.LogRecord:
+    return logging.LogRecord("tests", level, __file__, 1, msg, args, None)
+
+
+def test_sampling_filter_keeps_one_in_n_per_template():
+    sampler = SamplingFilter(0.1)
+    kept = sum(sampler.filter(_record("Fetched status for job %s", logging.INFO, i)) for i in range(100))
+    assert kept == 10
+    # A different template on the same logger has its own counter
+    assert sampler.filter(_record("Fetched %s recent jobs"))
+
+
+def test_sampling_filter_never_drops_warnings():
+    sampler = SamplingFilter(0.0)
+    assert not sampler.filter(_record("noisy"))
+    assert sampler.filter(_record("Job %s not found.", logging.WARNING, 1))
+
+
+def test_orjson_formatter_emits_json():
+    record = _record("Job %s done", logging.INFO, 7)
+    entry = json.loads(OrjsonFormatter().format(record))
+    assert entry["message"] == "Job 7 done"
+    assert entry["levelname"] == "INFO"
+    assert entry["name"] == "tests"
+
+
+def test_async_logging_writes_through_listener(restore_logging, capsys):
+    """
+    Tests that with async logging, records reach stdout via the queue listener
+    and sampled loggers drop most INFO records.
+    """
+    setup_logging(json_logs=True, async_logs=True, sample_rates={"tests.sampled": 0.5})
+    logger = logging.getLogger("tests.sampled")
+    for i in range(4):
+        logger.info("Fetched status for job %s", i)
+    logging_config._stop_listener()  # flushes the queue
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["message"] for line in lines] == ["Fetched status for job 0", "Fetched status for job 2"]
+
+
+@pytest.mark.parametrize("async_logs", [False, True])
+def test_exceptions_are_logged_the_same_sync_and_async(restore_logging, capsys, async_logs):
+    """
+    Tests that the traceback stays in its own JSON field when records are
+    formatted by the listener thread.
+    """
+    setup_logging(json_logs=True, async_logs=async_logs)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("tests").exception("Job %s failed", 3)
+    logging_config._stop_listener()
+
+    [entry] = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert entry["message"] == "Job 3 failed"
+    assert "ValueError: boom" in entry["exc_info"]
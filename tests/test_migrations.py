@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+
+from src.api.core.database import Base
+from src.api.core.migrations import upgrade
+from src.api.models.sql_models import job  # noqa: F401
+
+
+def test_migrations_create_jobs_table(tmp_path: Path):
+    """
+    Tests that upgrading to head on an empty database creates the jobs table.
+    """
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    upgrade("head", database_url=url)
+
+    engine = create_engine(url)
+    inspector = inspect(engine)
+    assert "jobs" in inspector.get_table_names()
+    assert "alembic_version" in inspector.get_table_names()
+    engine.dispose()
+
+
+def test_migrations_match_models(tmp_path: Path):
+    """
+    Tests that the migrated schema matches the SQLAlchemy models, so a model
+    change without a matching migration is caught.
+    """
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    upgrade("head", database_url=url)
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    engine.dispose()
+    assert diff == []
+
+
+def test_drain_rate_query_uses_status_updated_at_index(tmp_path: Path):
+    """
+    Tests that counting recently finished jobs is an index range scan, not a
+    scan over every completed or failed job.
+    """
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    upgrade("head", database_url=url)
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT job_type, count(*) FROM jobs "
+            "WHERE status IN ('completed', 'failed') AND updated_at >= '2026-01-01' GROUP BY job_type"
+        ).all()
+    engine.dispose()
+    assert any("ix_jobs_status_updated_at" in row[-1] for row in plan)
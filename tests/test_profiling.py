@@ -0,0 +1,81 @@
+import threading
+import time
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.api.core.profiling import PhaseTimer, StackSampler, TimingStats, merge_collapsed
+from src.api.core.settings import settings
+
+
+def busy_labelled_work(sampler: StackSampler, label: str, stop: threading.Event) -> None:
+    with sampler.label(label):
+        while not stop.is_set():
+            time.sleep(0.001)
+
+
+def test_timing_stats_aggregates_phases():
+    stats = TimingStats()
+    timer = PhaseTimer()
+    timer.add("db", 4.0)
+    timer.add("db", 2.0)
+    stats.record("submit_job", timer.phases)
+    stats.record("submit_job", {"db": 2.0})
+
+    snapshot = stats.snapshot()["submit_job"]["db"]
+    assert snapshot == {"count": 2, "mean_ms": 4.0, "max_ms": 6.0, "total_ms": 8.0}
+    assert timer.compact() == {"db": 6}
+
+
+def test_stack_sampler_filters_by_label():
+    """
+    Tests that a labelled profile only contains stacks of threads running that label.
+    """
+    sampler = StackSampler()
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_labelled_work, args=(sampler, "report", stop))
+    worker.start()
+    try:
+        matching = sampler.sample(0.1, interval=0.001, label="report")
+        other = sampler.sample(0.05, interval=0.001, label="email")
+    finally:
+        stop.set()
+        worker.join()
+
+    assert "busy_labelled_work" in matching
+    assert all(line.rpartition(" ")[2].isdigit() for line in matching.splitlines())
+    assert other == ""
+
+
+def test_merge_collapsed_sums_counts():
+    merged = merge_collapsed(["a;b 2\na;c 1", "a;b 3"])
+    assert merged.splitlines() == ["a;b 5", "a;c 1"]
+
+
+def test_admin_api_is_hidden_by_default(client: TestClient):
+    assert client.get("/admin/timings").status_code == 404
+
+
+def test_admin_timings_report_submit_phases(client: TestClient):
+    """
+    Tests that a submission records validation/db/publish/serialization phases.
+    """
+    client.post("/jobs/submit", json={"job_type": "send_email"})
+    with patch.object(settings, "admin_api_enabled", True):
+        response = client.get("/admin/timings")
+    assert response.status_code == 200
+    phases = response.json()["submit_job"]
+    assert {"validation", "db", "publish", "serialization"} <= set(phases)
+
+
+def test_admin_timings_report_listing_phases(client: TestClient):
+    client.get("/jobs/")
+    with patch.object(settings, "admin_api_enabled", True):
+        phases = client.get("/admin/timings").json()["get_all_jobs"]
+    assert {"validation", "db", "serialization"} <= set(phases)
+
+
+def test_admin_profile_rejects_too_small_interval(client: TestClient):
+    with patch.object(settings, "admin_api_enabled", True):
+        response = client.get("/admin/profile?seconds=0.01&interval=0.00001")
+    assert response.status_code == 422
@@ -0,0 +1,47 @@
+import pytest
+from kombu.serialization import dumps, loads
+
+from src.api.core.serialization import CONTENT_TYPE, SERIALIZER_NAME, make_codec, register_job_serializer
+
+
+def test_small_message_is_not_compressed():
+    """
+    Tests that bodies below the threshold are stored as plain msgpack.
+    """
+    encode, decode = make_codec("zstd", threshold=1024)
+    body = ((1,), {}, {"callbacks": None})
+    data = encode(body)
+    assert data[:1] == b"\x00"
+    assert decode(data) == [[1], {}, {"callbacks": None}]
+
+
+def test_large_message_is_compressed():
+    """
+    Tests that bodies above the threshold are compressed and round-trip intact.
+    """
+    encode, decode = make_codec("zstd", threshold=64)
+    payload = {"rows": [{"id": i, "region": "eu-west"} for i in range(200)]}
+    data = encode(payload)
+    assert data[:1] == b"\x01"
+    assert len(data) < len(make_codec("none")[0](payload))
+    assert decode(data) == payload
+
+
+def test_unknown_compression_flag_is_rejected():
+    """
+    Tests that a frame with an unknown header byte raises instead of being misread.
+    """
+    _, decode = make_codec("zstd")
+    with pytest.raises(ValueError):
+        decode(b"\x7fgarbage")
+
+
+def test_registered_with_kombu():
+    """
+    Tests that the serializer is usable through kombu alongside JSON.
+    """
+    register_job_serializer("zstd", threshold=16)
+    content_type, content_encoding, data = dumps({"payload": "x" * 100}, serializer=SERIALIZER_NAME)
+    assert content_type == CONTENT_TYPE
+    assert content_encoding == "binary"
+    assert loads(data, content_type, content_encoding, accept=[CONTENT_TYPE]) == {"payload": "x" * 100}
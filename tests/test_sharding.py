@@ -0,0 +1,219 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.api.core.database import ShardSessions, get_shard_sessions
+from src.api.core.ids import MAX_NODE, TIMESTAMP_SHIFT, NodeLease, SnowflakeIdGenerator, shard_of
+from src.api.core.migrations import upgrade
+from src.api.main import app
+from src.api.models.job import JobStatus
+from src.api.models.sql_models.job import Job as JobModel
+from src.worker.celery_worker import process_job
+
+SHARDS = 3
+
+
+@pytest.fixture(scope="function")
+def shard_factories(tmp_path: Path):
+    """
+    One migrated SQLite file per shard, standing in for separate databases.
+    """
+    urls = [f"sqlite:///{tmp_path / f'shard{i}.db'}" for i in range(SHARDS)]
+    engines = []
+    for url in urls:
+        upgrade("head", database_url=url)
+        engines.append(create_engine(url, connect_args={"check_same_thread": False}))
+    factories = [sessionmaker(autocommit=False, autoflush=False, bind=engine) for engine in engines]
+    with patch("src.worker.db_utils.get_shard_urls", return_value=urls), \
+            patch("src.worker.db_utils.get_shard_session_factory", side_effect=lambda shard: factories[shard]):
+        yield factories
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def sharded_client(shard_factories):
+    def override_get_shard_sessions():
+        sessions = ShardSessions(shard_factories)
+        try:
+            yield sessions
+        finally:
+            sessions.close()
+
+    app.dependency_overrides[get_shard_sessions] = override_get_shard_sessions
+    with patch("src.api.routers.jobs.get_celery_app"), TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+def _ids_on_shard(factory) -> set:
+    db = factory()
+    try:
+        return {job_id for (job_id,) in db.query(JobModel.id).all()}
+    finally:
+        db.close()
+
+
+def test_ids_encode_shard_and_are_time_ordered():
+    generator = SnowflakeIdGenerator(node_id=MAX_NODE)
+    ids = [generator.next_id(shard % 5) for shard in range(3000)]
+    assert [shard_of(job_id) for job_id in ids] == [shard % 5 for shard in range(3000)]
+    timestamps = [job_id >> TIMESTAMP_SHIFT for job_id in ids]
+    assert timestamps == sorted(timestamps)
+    assert ids[::5] == sorted(ids[::5])
+    assert len(set(ids)) == len(ids)
+    # Ids from the old serial primary key keep living on the first shard
+    assert all(shard_of(job_id) == 0 for job_id in (1, 123456, 5_000_000, 50_000_000, 2**31 - 1))
+    assert min(ids) > 2**31
+    # Exact as JSON numbers in JavaScript
+    assert max(ids) < 2**53
+
+
+class FakeLeaseRedis:
+    """
+    The SET NX and compare-and-set scripts NodeLease uses; `expire` drops a key
+    as Redis would once its TTL passes.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def eval(self, script, numkeys, key, token, *args):
+        if self.data.get(key) != token:
+            return 0
+        if "expire" in script:
+            return 1
+        del self.data[key]
+        return 1
+
+    def expire(self, key):
+        self.data.pop(key, None)
+
+
+def test_node_id_leases_are_exclusive_until_released():
+    client = FakeLeaseRedis()
+    leases = [NodeLease(client) for _ in range(MAX_NODE + 1)]
+    assert [lease.acquire() for lease in leases] == list(range(MAX_NODE + 1))
+
+    # All taken: a further process fails to start rather than reuse one
+    with pytest.raises(RuntimeError):
+        NodeLease(client).acquire()
+
+    leases[5].release()
+    assert NodeLease(client).acquire() == 5
+    # A released lease can no longer free or extend the new holder's key
+    leases[5].release()
+    assert not leases[5].refresh()
+    assert client.data["jobs:node:5"] != leases[5].token
+
+
+def test_lost_lease_stops_ids_until_another_is_claimed():
+    """
+    Tests that a process whose lease expired issues no ids, and that its
+    heartbeat claims a free node id instead of the one now held by another.
+    """
+    client = FakeLeaseRedis()
+    lease = NodeLease(client, ttl=30)
+    generator = SnowflakeIdGenerator(lease.acquire(), lease=lease)
+    generator.next_id(0)
+
+    with patch("src.api.core.ids.time.monotonic", return_value=lease._valid_until + 1):
+        with pytest.raises(RuntimeError):
+            generator.next_id(0)
+
+    client.expire("jobs:node:0")
+    assert NodeLease(client).acquire() == 0
+    lease.heartbeat_once()
+    assert lease.node_id == 1
+    assert (generator.next_id(0) >> 5) & MAX_NODE == 1
+
+
+def test_submitted_jobs_are_spread_and_routed_by_id(sharded_client: TestClient, shard_factories):
+    job_ids = [
+        sharded_client.post("/jobs/submit", json={"job_type": "send_email", "payload": {}}).json()["job_id"]
+        for _ in range(SHARDS * 4)
+    ]
+
+    for shard, factory in enumerate(shard_factories):
+        stored = _ids_on_shard(factory)
+        assert len(stored) == 4
+        assert all(shard_of(job_id) == shard for job_id in stored)
+
+    for job_id in job_ids:
+        response = sharded_client.get(f"/jobs/status/{job_id}")
+        assert response.status_code == 200
+        assert response.json()["job_id"] == job_id
+
+
+def test_listing_merges_newest_jobs_across_shards(sharded_client: TestClient):
+    job_ids = [
+        sharded_client.post("/jobs/submit", json={"job_type": "report", "payload": {}}).json()["job_id"]
+        for _ in range(60)
+    ]
+
+    listed = [job["job_id"] for job in sharded_client.get("/jobs/").json()]
+    assert listed == sorted(job_ids, reverse=True)[:50]
+
+
+def test_listing_records_phase_per_shard(sharded_client: TestClient):
+    with patch("src.api.routers.jobs.api_timings") as mock_timings:
+        sharded_client.get("/jobs/")
+    operation, phases = mock_timings.record.call_args.args
+    assert operation == "get_all_jobs"
+    assert {"db", "db.shard0", "db.shard1", "db.shard2", "serialization"} <= set(phases)
+
+
+def test_status_of_id_on_unknown_shard_is_404(sharded_client: TestClient):
+    job_id = SnowflakeIdGenerator(node_id=0).next_id(SHARDS)
+    assert sharded_client.get(f"/jobs/status/{job_id}").status_code == 404
+
+
+def test_worker_updates_job_on_its_shard(sharded_client: TestClient, shard_factories):
+    job_ids = [
+        sharded_client.post("/jobs/submit", json={"job_type": "send_email", "payload": {}}).json()["job_id"]
+        for _ in range(SHARDS)
+    ]
+
+    with patch("src.worker.celery_worker.time.sleep"):
+        for job_id in job_ids:
+            process_job.apply(args=[job_id])
+
+    for job_id in job_ids:
+        assert sharded_client.get(f"/jobs/status/{job_id}").json()["status"] == JobStatus.COMPLETED.value
+
+
+def test_legacy_serial_ids_route_to_first_shard(sharded_client: TestClient, shard_factories):
+    """
+    Tests that jobs created before sharding (serial ids, here above 2**22) are
+    still found on shard 0 by the API and the worker.
+    """
+    db = shard_factories[0]()
+    db.add(JobModel(id=5_000_000, job_type="send_email", payload={}, status=JobStatus.QUEUED.value))
+    db.commit()
+    db.close()
+
+    assert sharded_client.get("/jobs/status/5000000").status_code == 200
+    with patch("src.worker.celery_worker.time.sleep"):
+        process_job.apply(args=[5_000_000])
+    assert sharded_client.get("/jobs/status/5000000").json()["status"] == JobStatus.COMPLETED.value
+
+
+def test_single_shard_routes_every_id_to_it(client: TestClient, db_session: Session):
+    """
+    Tests that without sharding any id is looked up in the one database.
+    """
+    job_id = SnowflakeIdGenerator(node_id=0).next_id(7)
+    db_session.add(JobModel(id=job_id, job_type="send_email", payload={}, status=JobStatus.QUEUED.value))
+    db_session.commit()
+
+    assert client.get(f"/jobs/status/{job_id}").status_code == 200
@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.api.core.celery_app import get_celery_app
+from src.api.models.job import JobStatus
+from src.api.core.profiling import job_timings
+from src.api.models.sql_models.job import Job as JobModel
+from src.worker.celery_worker import process_job, update_job_status_on_failure
+
+
+@pytest.fixture(scope="function")
+def worker_db(db_session: Session):
+    """
+    Points the worker's session factory at the test connection and skips the
+    simulated handler delays.
+    """
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=db_session.connection())
+    with patch("src.worker.db_utils.get_shard_session_factory", return_value=factory), \
+            patch("src.worker.celery_worker.time.sleep"):
+        yield db_session
+
+
+def _create_job(db: Session, job_type: str) -> int:
+    job = JobModel(job_type=job_type, payload={}, status=JobStatus.QUEUED.value)
+    db.add(job)
+    db.commit()
+    return int(job.id)
+
+
+def test_process_job_writes_result_to_jobs_table(worker_db: Session):
+    """
+    Tests that a processed job's terminal state and result end up in the jobs
+    table, and that the task itself returns nothing.
+    """
+    job_id = _create_job(worker_db, "send_email")
+
+    outcome = process_job.apply(args=[job_id])
+    assert outcome.result is None
+
+    job = worker_db.query(JobModel).filter(JobModel.id == job_id).first()
+    worker_db.refresh(job)
+    assert job.status == JobStatus.COMPLETED.value
+    assert job.result == {"status": "success", "message": "Email sent successfully."}
+    assert job.error_message is None
+
+
+def test_failure_handler_marks_job_failed(worker_db: Session):
+    """
+    Tests that the failure handler records the final error in the jobs table.
+    """
+    job_id = _create_job(worker_db, "data_analysis")
+
+    update_job_status_on_failure(process_job, RuntimeError("boom"), "task-id", (job_id,), {}, None)
+
+    job = worker_db.query(JobModel).filter(JobModel.id == job_id).first()
+    worker_db.refresh(job)
+    assert job.status == JobStatus.FAILED.value
+    assert job.error_message["error"] == "boom"
+
+
+def test_results_are_not_stored_in_celery_backend():
+    """
+    Tests that, by default, Celery has no result backend and ignores task results.
+    """
+    app = get_celery_app()
+    assert app.conf.task_ignore_result is True
+    assert app.backend.as_uri() == "disabled://"
+
+
+def test_process_job_stores_phase_timings(worker_db: Session):
+    """
+    Tests that the job row keeps this attempt's phase timings in milliseconds.
+    """
+    job_id = _create_job(worker_db, "send_email")
+    process_job.apply(args=[job_id])
+
+    job = worker_db.query(JobModel).filter(JobModel.id == job_id).first()
+    worker_db.refresh(job)
+    assert set(job.timings) == {"queue_wait", "claim", "handler"}
+    assert all(isinstance(ms, int) and ms >= 0 for ms in job.timings.values())
+
+
+def test_failed_attempts_store_and_record_timings(worker_db: Session):
+    """
+    Tests that retried and finally failed attempts keep their phase timings
+    and are aggregated separately from successful ones.
+    """
+    job_id = _create_job(worker_db, "data_analysis")
+    job_timings.reset()
+
+    with patch("src.worker.celery_worker.run_job_handler", side_effect=RuntimeError("boom")):
+        process_job.apply(args=[job_id])
+
+    job = worker_db.query(JobModel).filter(JobModel.id == job_id).first()
+    worker_db.refresh(job)
+    assert {"claim", "handler"} <= set(job.timings)
+    stats = job_timings.snapshot()["data_analysis:failed"]
+    assert stats["handler"]["count"] == process_job.max_retries + 1